@@ -76,7 +76,8 @@ class RFPOrchestrator:
         rfp_files: List[str],
         template_name: str = "government_canada",
         output_formats: List[str] = ["md"],
-        team_cvs: Optional[List[str]] = None
+        team_cvs: Optional[List[str]] = None,
+        project_id: Optional[str] = None
     ) -> Dict:
         """
         Execute complete RFP response workflow.
@@ -86,6 +87,8 @@ class RFPOrchestrator:
             template_name: Proposal template to use
             output_formats: Output formats (md, docx, pdf)
             team_cvs: Optional list of team member CV/resume files (PDF, DOCX)
+            project_id: Unique ID naming the output files (default: a
+                timestamp, which is only unique for one run at a time)
 
         Returns:
             State dictionary with all outputs
@@ -100,7 +103,7 @@ class RFPOrchestrator:
 
         # Initialize state
         state = {
-            "project_id": f"RFP-{datetime.now().strftime('%Y%m%d-%H%M%S')}",
+            "project_id": project_id or f"RFP-{datetime.now().strftime('%Y%m%d-%H%M%S')}",
             "rfp_files": rfp_files,
             "template_name": template_name,
             "output_formats": output_formats,
@@ -6,6 +6,7 @@ FastAPI REST API for RFP response generation
 import os
 import sys
 import uuid
+import shutil
 import asyncio
 from typing import List, Optional
 from datetime import datetime
@@ -46,6 +47,9 @@ try:
 except OSError:
     pass  # read-only FS; dirs created on first use or use /tmp above
 
+# Uploads are copied to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 # Job storage (in production, use Redis or database)
 jobs = {}
 
@@ -109,6 +113,13 @@ if web_dir.exists():
 # Helper Functions
 # =============================================================================
 
+def save_upload(upload: UploadFile, file_path: Path):
+    """Copy an upload's spooled file to disk chunk by chunk, never as one bytes object."""
+    upload.file.seek(0)
+    with open(file_path, "wb") as f:
+        shutil.copyfileobj(upload.file, f, UPLOAD_CHUNK_SIZE)
+
+
 async def send_progress(job_id: str, progress: int, message: str):
     """Send progress update via WebSocket."""
     if job_id in ws_connections:
@@ -288,19 +299,15 @@ async def upload_rfp(
         "result": None
     }
 
+    # Create job-specific directory
+    job_dir = UPLOAD_DIR / job_id
+    job_dir.mkdir(exist_ok=True)
+
     # Save uploaded files
     saved_files = []
     for file in files:
-        # Create job-specific directory
-        job_dir = UPLOAD_DIR / job_id
-        job_dir.mkdir(exist_ok=True)
-
-        # Save file
         file_path = job_dir / file.filename
-        content = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(content)
-
+        await asyncio.to_thread(save_upload, file, file_path)
         saved_files.append(file_path)
 
     # Parse output formats
@@ -405,7 +412,6 @@ async def delete_job(job_id: str):
     # Delete uploaded files
     job_dir = UPLOAD_DIR / job_id
     if job_dir.exists():
-        import shutil
         shutil.rmtree(job_dir)
 
     # Remove job from memory
@@ -121,6 +121,20 @@ BUDGET_LIMIT_USD = float(os.getenv("BUDGET_LIMIT_USD", "100.0"))  # Max cost per
 COST_ALERT_THRESHOLD = float(os.getenv("COST_ALERT_THRESHOLD", "0.75"))  # Alert at 75%
 ENABLE_COST_APPROVAL = os.getenv("ENABLE_COST_APPROVAL", "false").lower() == "true"
 
+# ══════════════════════════════════════
+# FILE DE TRAVAUX (WEB UI)
+# ══════════════════════════════════════
+# Vide : les jobs tournent dans le processus web (memoire locale)
+# redis://host:6379/0 : jobs executes par des workers Celery (celery -A web.tasks worker)
+REDIS_URL = os.getenv("REDIS_URL", "")
+# Processus uvicorn du serveur web (0 = un par coeur) ; ignore sans REDIS_URL
+WEB_WORKERS = int(os.getenv("WEB_WORKERS", "0"))
+# Limites d'upload : taille max d'une requete (Mo) et uploads ecrits en parallele
+MAX_UPLOAD_MB = int(os.getenv("MAX_UPLOAD_MB", "200"))
+UPLOAD_CONCURRENCY = int(os.getenv("UPLOAD_CONCURRENCY", "8"))
+# Delai max (secondes) sans donnees recues avant d'abandonner un upload
+UPLOAD_READ_TIMEOUT = int(os.getenv("UPLOAD_READ_TIMEOUT", "60"))
+
 # ══════════════════════════════════════
 # SORTIE
 # ══════════════════════════════════════
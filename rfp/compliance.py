@@ -4,7 +4,7 @@ Extract requirements from RFPs and map proposal responses to them
 """
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from enum import Enum
 import re
 
@@ -28,7 +28,7 @@ class ComplianceStatus(Enum):
     NOT_ADDRESSED = "not_addressed"
 
 
-@dataclass
+@dataclass(slots=True)
 class Requirement:
     """Represents a single RFP requirement."""
     id: str
@@ -45,7 +45,7 @@ class Requirement:
         return any(keyword.lower() in text_lower for keyword in self.keywords)
 
 
-@dataclass
+@dataclass(slots=True)
 class RequirementMapping:
     """Maps a requirement to proposal response."""
     requirement: Requirement
@@ -67,22 +67,26 @@ class ComplianceMatrix:
     requirements: List[Requirement]
     mappings: List[RequirementMapping] = field(default_factory=list)
 
+    def _mandatory_counts(self) -> Tuple[int, int]:
+        """Return (mandatory requirements, fully compliant mandatory mappings)."""
+        total = sum(r.is_mandatory for r in self.requirements)
+        compliant = sum(
+            m.requirement.is_mandatory and m.is_compliant()
+            for m in self.mappings
+        )
+        return total, compliant
+
     @property
     def compliance_score(self) -> float:
         """Calculate overall compliance percentage."""
         if not self.requirements:
             return 0.0
 
-        mandatory_reqs = [r for r in self.requirements if r.is_mandatory]
-        if not mandatory_reqs:
+        total, compliant = self._mandatory_counts()
+        if not total:
             return 100.0
 
-        compliant_mandatory = sum(
-            1 for m in self.mappings
-            if m.requirement.is_mandatory and m.is_compliant()
-        )
-
-        return (compliant_mandatory / len(mandatory_reqs)) * 100
+        return (compliant / total) * 100
 
     def get_gaps(self) -> List[Requirement]:
         """Get requirements that are not fully addressed."""
@@ -91,7 +95,10 @@ class ComplianceMatrix:
 
     def is_fully_compliant(self) -> bool:
         """Check if all mandatory requirements are met."""
-        return self.compliance_score == 100.0
+        if not self.requirements:
+            return False
+        total, compliant = self._mandatory_counts()
+        return compliant == total
 
     def to_markdown(self) -> str:
         """Generate markdown table of compliance matrix."""
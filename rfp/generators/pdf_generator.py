@@ -4,7 +4,14 @@ Converts DOCX to PDF or generates PDF directly
 """
 
 import os
+import time
+import atexit
+import shutil
+import socket
+import tempfile
+import functools
 import subprocess
+from pathlib import Path
 from typing import Dict, Optional
 
 # Try multiple PDF generation approaches
@@ -51,6 +58,119 @@ if PDF_METHOD is None:
     except Exception:
         pass
 
+# Persistent LibreOffice listener (optional): conversions sent through
+# unoconv reuse one warm soffice process instead of a cold start per file
+SOFFICE_HOST = "localhost"
+SOFFICE_PORT = 2002
+SOFFICE_CONNECTION = f"socket,host={SOFFICE_HOST},port={SOFFICE_PORT};urp;StarOffice.ComponentContext"
+
+_soffice_process = None
+
+# Per-process LibreOffice user profiles live here, suffixed with the PID
+PROFILE_PREFIX = "kplw-libreoffice-"
+
+
+def _pid_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+@functools.lru_cache(maxsize=None)
+def _libreoffice_profile(pid: int) -> str:
+    """
+    LibreOffice user profile for one process, as a file:// URI.
+
+    Two soffice instances on the same profile collide (the second can exit
+    without writing output), so each process converts with its own, and
+    pays the profile's cold initialization once rather than per file.
+    Pool and Celery workers exit without running atexit hooks, so profiles
+    left by processes that are gone are removed here as well.
+    """
+    tmp_dir = Path(tempfile.gettempdir())
+    for stale in tmp_dir.glob(f"{PROFILE_PREFIX}*"):
+        owner = stale.name[len(PROFILE_PREFIX):]
+        if owner.isdigit() and int(owner) != pid and not _pid_running(int(owner)):
+            shutil.rmtree(stale, ignore_errors=True)
+
+    profile = tmp_dir / f"{PROFILE_PREFIX}{pid}"
+    atexit.register(shutil.rmtree, profile, ignore_errors=True)
+    return profile.as_uri()
+
+
+def soffice_daemon_running() -> bool:
+    """Check whether a LibreOffice listener is accepting connections."""
+    try:
+        with socket.create_connection((SOFFICE_HOST, SOFFICE_PORT), timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+
+def start_soffice_daemon(timeout: float = 20.0) -> bool:
+    """
+    Start a headless LibreOffice listener for the lifetime of this process.
+
+    Only useful together with unoconv, which converts through the listener.
+
+    Args:
+        timeout: Seconds to wait for the listener to accept connections
+
+    Returns:
+        True if a listener is running (started here or already up)
+    """
+    global _soffice_process
+
+    if soffice_daemon_running():
+        return True
+
+    binary = shutil.which("soffice") or shutil.which("libreoffice")
+    if not binary or not shutil.which("unoconv"):
+        return False
+
+    _soffice_process = subprocess.Popen(
+        [
+            binary,
+            '--headless',
+            '--invisible',
+            '--norestore',
+            f'--accept={SOFFICE_CONNECTION}'
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    atexit.register(stop_soffice_daemon, os.getpid())
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if soffice_daemon_running():
+            return True
+        if _soffice_process.poll() is not None:
+            break
+        time.sleep(0.25)
+
+    stop_soffice_daemon()
+    return False
+
+
+def stop_soffice_daemon(owner_pid: Optional[int] = None):
+    """Terminate the listener started by start_soffice_daemon()."""
+    global _soffice_process
+
+    if _soffice_process is None or (owner_pid is not None and owner_pid != os.getpid()):
+        return
+
+    _soffice_process.terminate()
+    try:
+        _soffice_process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        _soffice_process.kill()
+    _soffice_process = None
+
 
 class PDFGenerator:
     """Generate PDF proposals from DOCX or markdown."""
@@ -94,7 +214,10 @@ class PDFGenerator:
         print(f"  [PDF] Converting using {self.method}...")
 
         try:
-            if self.method == "docx2pdf":
+            if self.method in ("libreoffice", "unoconv") and self._daemon_available():
+                self._convert_unoconv(docx_path, output_path, connection=SOFFICE_CONNECTION)
+
+            elif self.method == "docx2pdf":
                 self._convert_docx2pdf(docx_path, output_path)
 
             elif self.method == "pypandoc":
@@ -119,6 +242,10 @@ class PDFGenerator:
         except Exception as e:
             raise RuntimeError(f"PDF generation failed: {e}")
 
+    def _daemon_available(self) -> bool:
+        """Check whether conversions can go through a warm LibreOffice listener."""
+        return shutil.which("unoconv") is not None and soffice_daemon_running()
+
     def _convert_docx2pdf(self, docx_path: str, output_path: str):
         """Convert using docx2pdf."""
         docx2pdf_convert(docx_path, output_path)
@@ -141,6 +268,7 @@ class PDFGenerator:
         result = subprocess.run(
             [
                 'libreoffice',
+                f'-env:UserInstallation={_libreoffice_profile(os.getpid())}',
                 '--headless',
                 '--convert-to', 'pdf',
                 '--outdir', output_dir,
@@ -162,10 +290,15 @@ class PDFGenerator:
         if generated_pdf != output_path and os.path.exists(generated_pdf):
             os.rename(generated_pdf, output_path)
 
-    def _convert_unoconv(self, docx_path: str, output_path: str):
-        """Convert using unoconv."""
+    def _convert_unoconv(self, docx_path: str, output_path: str, connection: Optional[str] = None):
+        """Convert using unoconv (through a running listener if connection is given)."""
+        command = ['unoconv']
+        if connection:
+            command += ['--connection', connection]
+        command += ['-f', 'pdf', '-o', output_path, docx_path]
+
         result = subprocess.run(
-            ['unoconv', '-f', 'pdf', '-o', output_path, docx_path],
+            command,
             capture_output=True,
             text=True,
             timeout=120
@@ -3,11 +3,23 @@ Proposal Structure Templates
 Configurable templates for different types of RFP responses
 """
 
+import sys
+import json
+import textwrap
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from functools import cached_property
+from types import MappingProxyType
+from typing import List, Iterable, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
 
+# Optional: msgspec decodes and validates templates in C
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
 
-@dataclass
+
+@dataclass(frozen=True)
 class ProposalSection:
     """Defines a section in a proposal."""
     name: str
@@ -17,14 +29,72 @@ class ProposalSection:
     order: int = 0
 
 
-@dataclass
+class FormattingSpec(NamedTuple):
+    """Typed, read-only view of a template's formatting rules."""
+    font: str = ""
+    font_size: str = ""
+    line_spacing: str = ""
+    margins: str = ""
+    page_numbers: str = ""
+    header: str = ""
+    branding: str = ""
+    style: str = ""
+    emphasis: str = ""
+    bilingual: str = ""
+    annexes: str = ""
+    diagrams: str = ""
+    code_samples: str = ""
+
+    @classmethod
+    def from_dict(cls, formatting: Mapping[str, str]) -> "FormattingSpec":
+        """Build from a formatting dict, ignoring keys outside the schema."""
+        return cls(**{k: v for k, v in formatting.items() if k in cls._fields})
+
+
+class FrozenDict(dict):
+    """
+    dict that rejects changes after construction.
+
+    Unlike MappingProxyType it is still a dict, so templates holding one
+    pickle, deep-copy and go through dataclasses.asdict as before.
+    """
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} is read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+
+@dataclass(frozen=True)
 class ProposalStructure:
-    """Defines the complete structure of a proposal."""
+    """
+    Defines the complete structure of a proposal.
+
+    Instances are read-only all the way down: sections are stored as a tuple
+    and formatting as a read-only mapping, so the shared predefined
+    templates cannot be changed by one caller for the next.
+    """
     template_name: str
-    sections: List[ProposalSection]
-    formatting: Dict[str, str] = field(default_factory=dict)
+    sections: Tuple[ProposalSection, ...]
+    formatting: Mapping[str, str] = field(default_factory=dict, hash=False)
     instructions: str = ""
 
+    def __post_init__(self):
+        object.__setattr__(self, "sections", tuple(self.sections))
+        object.__setattr__(self, "formatting", FrozenDict(self.formatting))
+        # Strip source indentation once instead of on every render
+        object.__setattr__(self, "instructions", sys.intern(textwrap.dedent(self.instructions).strip()))
+
+    @cached_property
+    def formatting_spec(self) -> FormattingSpec:
+        """Typed view of the formatting rules (built on first access)."""
+        return FormattingSpec.from_dict(self.formatting)
+
     def get_section_names(self) -> List[str]:
         """Get list of section names in order."""
         return [s.name for s in sorted(self.sections, key=lambda x: x.order)]
@@ -33,25 +103,34 @@ class ProposalStructure:
         """Get only required sections."""
         return [s for s in self.sections if s.required]
 
-    def validate_proposal(self, sections_present: List[str]) -> tuple[bool, List[str]]:
+    @cached_property
+    def _required_names(self) -> Tuple[str, ...]:
+        """Required section names in template order (computed once)."""
+        return tuple(dict.fromkeys(s.name for s in self.sections if s.required))
+
+    def is_valid(self, sections_present: Iterable[str]) -> bool:
+        """Check that all required sections are present (stops at first miss)."""
+        present = set(sections_present)
+        return all(name in present for name in self._required_names)
+
+    def validate_proposal(self, sections_present: Iterable[str]) -> tuple[bool, List[str]]:
         """
         Validate that proposal has all required sections.
 
         Returns:
             (is_valid, missing_sections)
         """
-        required_names = {s.name for s in self.get_required_sections()}
-        present_names = set(sections_present)
-        missing = list(required_names - present_names)
+        present = set(sections_present)
+        missing = [name for name in self._required_names if name not in present]
 
-        return (len(missing) == 0, missing)
+        return (not missing, missing)
 
 
 # ═══════════════════════════════════════════════════════════════════
 # PREDEFINED PROPOSAL TEMPLATES
 # ═══════════════════════════════════════════════════════════════════
 
-PROPOSAL_TEMPLATES = {
+PROPOSAL_TEMPLATES = MappingProxyType({
     "government_canada": ProposalStructure(
         template_name="Government of Canada RFP",
         sections=[
@@ -485,22 +564,64 @@ PROPOSAL_TEMPLATES = {
         Address scalability, performance, security.
         """
     ),
+})
+
+
+# Display order for template lists (most common RFP types first)
+_TEMPLATE_PRIORITY = {
+    "government_canada": 0,
+    "corporate": 1,
+    "it_services": 2,
+    "consulting": 3,
+    "international_development": 4,
 }
 
 
+def _template_rank(name: str) -> int:
+    """Sort key for template names (unknown templates go last)."""
+    return _TEMPLATE_PRIORITY.get(name, len(_TEMPLATE_PRIORITY))
+
+
+_SORTED_TEMPLATE_NAMES: Tuple[str, ...] = tuple(sorted(PROPOSAL_TEMPLATES, key=_template_rank))
+
+
+# Required-name sets per template, in display order, for batch scoring
+_REQUIRED_NAME_SETS: Tuple[frozenset, ...] = tuple(
+    frozenset(PROPOSAL_TEMPLATES[name]._required_names) for name in _SORTED_TEMPLATE_NAMES
+)
+
+
 def get_template(template_name: str) -> Optional[ProposalStructure]:
-    """Get proposal template by name."""
+    """Get proposal template by name (shared, read-only instance)."""
     return PROPOSAL_TEMPLATES.get(template_name)
 
 
 def list_templates() -> List[str]:
-    """List available template names."""
-    return list(PROPOSAL_TEMPLATES.keys())
+    """List available template names in display order."""
+    return list(_SORTED_TEMPLATE_NAMES)
+
+
+def validate_bulk(documents: Iterable[Iterable[str]]) -> List[List[int]]:
+    """
+    Score many draft proposals against every predefined template.
+
+    Args:
+        documents: One iterable of section names per draft proposal
+
+    Returns:
+        Missing required-section counts, one row per document and one
+        column per template (columns follow list_templates() order)
+    """
+    results = []
+    for sections_present in documents:
+        present = frozenset(sections_present)
+        results.append([len(required - present) for required in _REQUIRED_NAME_SETS])
+    return results
 
 
 def create_custom_template(
     name: str,
-    sections: List[ProposalSection],
+    sections: Sequence[ProposalSection],
     **kwargs
 ) -> ProposalStructure:
     """Create a custom proposal template."""
@@ -511,7 +632,75 @@ def create_custom_template(
     )
 
 
-@dataclass
+# Field types checked by load_template's json fallback, as msgspec checks them
+_SECTION_FIELD_TYPES = {
+    "name": (str,),
+    "required": (bool,),
+    "max_pages": (int, type(None)),
+    "description": (str,),
+    "order": (int,),
+}
+
+
+def _expect(value, types: tuple, path: str):
+    """Return value if it has one of the JSON types (a bool is not an int), else raise ValueError."""
+    if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+        expected = " or ".join("null" if t is type(None) else t.__name__ for t in types)
+        raise ValueError(f"Invalid template definition: expected {expected} at {path}")
+    return value
+
+
+def _require(obj: dict, key: str, path: str):
+    """Return obj[key], or raise ValueError naming the missing field."""
+    if key not in obj:
+        raise ValueError(f"Invalid template definition: missing required field {key!r} at {path}")
+    return obj[key]
+
+
+def load_template(data: Union[str, bytes]) -> ProposalStructure:
+    """
+    Load a proposal template from JSON.
+
+    Uses msgspec (typed decode with validation) when installed, otherwise
+    falls back to the json module with the same type checks, so a template
+    is accepted or rejected the same way either way.
+
+    Args:
+        data: JSON document with template_name, sections, formatting, instructions
+
+    Returns:
+        ProposalStructure instance
+
+    Raises:
+        ValueError: If the JSON is malformed or does not match the template schema
+    """
+    if MSGSPEC_AVAILABLE:
+        return msgspec.json.decode(data, type=ProposalStructure)
+
+    raw = _expect(json.loads(data), (dict,), "$")
+    sections = []
+    for i, spec in enumerate(_expect(_require(raw, "sections", "$"), (list,), "$.sections")):
+        path = f"$.sections[{i}]"
+        _expect(spec, (dict,), path)
+        _require(spec, "name", path)
+        sections.append(ProposalSection(**{
+            key: _expect(spec[key], types, f"{path}.{key}")
+            for key, types in _SECTION_FIELD_TYPES.items() if key in spec
+        }))
+
+    formatting = _expect(raw.get("formatting", {}), (dict,), "$.formatting")
+    for key, value in formatting.items():
+        _expect(value, (str,), f"$.formatting[{key!r}]")
+
+    return ProposalStructure(
+        template_name=_expect(_require(raw, "template_name", "$"), (str,), "$.template_name"),
+        sections=sections,
+        formatting=formatting,
+        instructions=_expect(raw.get("instructions", ""), (str,), "$.instructions")
+    )
+
+
+@dataclass(frozen=True)
 class TemplateMetadata:
     """Metadata for template selection in UI."""
     name: str  # Internal ID (e.g., "government_canada")
@@ -519,32 +708,43 @@ class TemplateMetadata:
     description: str  # French description
 
 
-def get_all_templates() -> List[TemplateMetadata]:
-    """Get all available templates with French metadata for UI."""
-    return [
-        TemplateMetadata(
-            name="government_canada",
-            display_name="Gouvernement du Canada",
-            description="Modèle pour les appels d'offres du gouvernement canadien (fédéral et provincial)"
-        ),
-        TemplateMetadata(
-            name="corporate",
-            display_name="RFP Corporatif",
-            description="Modèle pour les propositions d'entreprises privées"
-        ),
-        TemplateMetadata(
-            name="consulting",
-            display_name="Services de Conseil",
-            description="Modèle pour les services de conseil stratégique et consulting"
-        ),
-        TemplateMetadata(
-            name="international_development",
-            display_name="Développement International",
-            description="Modèle pour les projets de développement international et coopération"
-        ),
-        TemplateMetadata(
-            name="it_services",
-            display_name="Services TI",
-            description="Modèle pour les services informatiques et développement logiciel"
-        ),
-    ]
+_TEMPLATE_METADATA = (
+    TemplateMetadata(
+        name="government_canada",
+        display_name="Gouvernement du Canada",
+        description="Modèle pour les appels d'offres du gouvernement canadien (fédéral et provincial)"
+    ),
+    TemplateMetadata(
+        name="corporate",
+        display_name="RFP Corporatif",
+        description="Modèle pour les propositions d'entreprises privées"
+    ),
+    TemplateMetadata(
+        name="consulting",
+        display_name="Services de Conseil",
+        description="Modèle pour les services de conseil stratégique et consulting"
+    ),
+    TemplateMetadata(
+        name="international_development",
+        display_name="Développement International",
+        description="Modèle pour les projets de développement international et coopération"
+    ),
+    TemplateMetadata(
+        name="it_services",
+        display_name="Services TI",
+        description="Modèle pour les services informatiques et développement logiciel"
+    ),
+)
+
+_ALL_TEMPLATES: Tuple[TemplateMetadata, ...] = tuple(
+    sorted(_TEMPLATE_METADATA, key=lambda t: _template_rank(t.name))
+)
+
+
+def get_all_templates() -> Sequence[TemplateMetadata]:
+    """
+    Get all available templates with French metadata for UI.
+
+    Returns the shared immutable tuple; use list(...) if a list is needed.
+    """
+    return _ALL_TEMPLATES
@@ -0,0 +1,97 @@
+"""
+Shared test fixtures
+Mock RFP workflow states used by the generator tests
+"""
+
+_FULL_STATE = {
+    "project_id": "TEST-RFP-001",
+    "status": "valide",
+    "rana_score": 85,
+    "compliance_score": 92.5,
+    "requirements_count": 15,
+    "iteration_count": 2,
+    "timbo_analysis": """# TIMBO Strategic Analysis
+
+## Executive Summary
+This is a test analysis conducted by TIMBO agent.
+
+## Key Findings
+- Strategic alignment identified
+- Risk assessment completed
+- Win strategy developed
+
+## Recommendations
+1. Proceed with proposal
+2. Focus on differentiators
+3. Address compliance gaps
+""",
+    "zat_blueprint": """# ZAT Proposal Blueprint
+
+## Structure Design
+- Template: Government of Canada
+- Sections: 11 required sections
+- Page limits: Adhered to all limits
+
+## Compliance Mapping
+All requirements mapped to appropriate sections.
+""",
+    "mary_deliverable": """# MARY Proposal Content
+
+## Executive Summary
+This proposal presents our comprehensive solution.
+
+## Technical Approach
+### Architecture
+Our solution leverages modern architecture patterns.
+
+### Implementation
+- Phase 1: Design
+- Phase 2: Development
+- Phase 3: Testing
+
+## Team Qualifications
+Our team has 10+ years experience.
+""",
+    "rana_evaluation": """# RANA Quality Evaluation
+
+## Overall Score: 85/100
+
+### Strengths
+- Strong technical approach
+- Comprehensive compliance
+- Professional presentation
+
+### Areas for Improvement
+- Minor formatting issues
+- Some sections could be expanded
+
+## Recommendation: VALIDE
+""",
+    "compliance_matrix": "# Compliance Matrix\n\nAll requirements addressed.",
+    "requirements": [],
+    "compliance_gaps": []
+}
+
+_MINIMAL_STATE = {
+    "project_id": "E2E-TEST-001",
+    "status": "valide",
+    "rana_score": 90,
+    "compliance_score": 95.0,
+    "requirements_count": 10,
+    "iteration_count": 1,
+    "timbo_analysis": "# Test Analysis\nTest content.",
+    "zat_blueprint": "# Test Blueprint\nTest content.",
+    "mary_deliverable": "# Test Proposal\nTest content.",
+    "rana_evaluation": "# Test Evaluation\nScore: 90/100",
+    "compliance_matrix": "# Test Matrix",
+    "requirements": [],
+    "compliance_gaps": []
+}
+
+# Read-only: tests pass these straight to the generators. Each test reads
+# them from this module in whatever process runs it; they are never passed
+# to workers as task arguments.
+MOCK_STATES = {
+    "full": _FULL_STATE,
+    "minimal": _MINIMAL_STATE,
+}
@@ -6,9 +6,16 @@ Test RFP-specific functionality: compliance extraction, proposal structure, RFP
 
 import sys
 import os
+import copy
+import pickle
+import dataclasses
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from test_utils import banner, record_failure, run_parallel, warm_imports
+
+BANNER = banner("KPLW Phase 2 Test Suite", "RFP Core Logic & Compliance")
+
 
 def test_compliance_extractor():
     """Test requirement extraction from RFP text."""
@@ -126,6 +133,40 @@ def test_proposal_structure():
         # Show first 3 sections
         for section in template.sections[:3]:
             print(f"    {section.order}. {section.name} (Required: {section.required})")
+
+        # Predefined templates are shared, so they must be read-only
+        try:
+            template.sections.append(template.sections[0])
+            print("✗ Template sections can be modified")
+        except AttributeError:
+            print("✓ Template sections are read-only")
+        try:
+            template.formatting["font"] = "Comic Sans MS"
+            print("✗ Template formatting can be modified")
+        except TypeError:
+            print("✓ Template formatting is read-only")
+        try:
+            hash(template)
+            print("✓ Template is hashable")
+        except TypeError as e:
+            print(f"✗ Template is not hashable: {e}")
+
+        # Read-only must not stop templates crossing process boundaries
+        for label, copy_of in (
+            ("pickle", lambda t: pickle.loads(pickle.dumps(t))),
+            ("deepcopy", copy.deepcopy),
+        ):
+            try:
+                copied = copy_of(template)
+                same = copied == template and copied.formatting == template.formatting
+                print(f"{'✓' if same else '✗'} Template round-trips through {label}")
+            except TypeError as e:
+                print(f"✗ Template cannot be copied with {label}: {e}")
+        try:
+            as_dict = dataclasses.asdict(template)
+            print(f"✓ Template converts with asdict ({len(as_dict['formatting'])} formatting rules)")
+        except TypeError as e:
+            print(f"✗ Template cannot be converted with asdict: {e}")
     else:
         print("✗ Failed to load template")
 
@@ -172,25 +213,80 @@ def test_rfp_orchestrator():
 
     except Exception as e:
         print(f"✗ Failed to initialize RFP orchestrator: {e}")
-        import traceback
-        traceback.print_exc()
+        record_failure(e)
+
+
+def test_template_loading():
+    """Test template loading from JSON and section validation."""
+    print("\n" + "=" * 60)
+    print("TEST 6: Template Loading & Validation")
+    print("=" * 60)
+
+    try:
+        import rfp.structure as structure
+
+        valid = (
+            '{"template_name": "Custom", "sections": [{"name": "Intro", "order": 1},'
+            ' {"name": "Annex", "required": false, "max_pages": 5}],'
+            ' "formatting": {"font": "Arial"}, "instructions": "  Be brief.  "}'
+        )
+        invalid = {
+            "non-string template name": '{"template_name": 1, "sections": []}',
+            "missing sections": '{"template_name": "Custom"}',
+            "bool as section order": '{"template_name": "Custom", "sections": [{"name": "A", "order": true}]}',
+            "non-string formatting value": '{"template_name": "Custom", "sections": [], "formatting": {"font": 12}}',
+            "malformed JSON": '{"template_name": ',
+        }
+
+        # The json fallback must accept and reject exactly what msgspec does
+        msgspec_available = structure.MSGSPEC_AVAILABLE
+        decoders = [False] + ([True] if msgspec_available else [])
+        try:
+            for use_msgspec in decoders:
+                label = "msgspec" if use_msgspec else "json fallback"
+                structure.MSGSPEC_AVAILABLE = use_msgspec
+
+                template = structure.load_template(valid)
+                print(f"✓ [{label}] Loaded {template.template_name}: {template.get_section_names()}, "
+                      f"font={template.formatting_spec.font}, instructions={template.instructions!r}")
+                for case, data in invalid.items():
+                    try:
+                        structure.load_template(data)
+                        print(f"✗ [{label}] Accepted {case}")
+                    except ValueError:
+                        print(f"✓ [{label}] Rejected {case}")
+        finally:
+            structure.MSGSPEC_AVAILABLE = msgspec_available
+
+        template = structure.get_template("corporate")
+        required = [s.name for s in template.get_required_sections()]
+        complete, incomplete = template.is_valid(required), template.is_valid(required[1:])
+        print(f"{'✓' if complete and not incomplete else '✗'} is_valid: "
+              f"{complete} with all required sections, {incomplete} without one")
+
+        scores = structure.validate_bulk([required, []])
+        missing = [row[structure.list_templates().index("corporate")] for row in scores]
+        print(f"{'✓' if missing == [0, len(required)] else '✗'} validate_bulk: "
+              f"{len(scores)} rows x {len(scores[0])} templates, corporate missing {missing}")
+
+    except Exception as e:
+        print(f"✗ Template loading test failed: {e}")
+        record_failure(e)
 
 
 def main():
     """Run all Phase 2 tests."""
-    print("\n")
-    print("╔" + "=" * 58 + "╗")
-    print("║" + " " * 58 + "║")
-    print("║" + "  KPLW Phase 2 Test Suite".center(58) + "║")
-    print("║" + "  RFP Core Logic & Compliance".center(58) + "║")
-    print("║" + " " * 58 + "║")
-    print("╚" + "=" * 58 + "╝")
-
-    test_compliance_extractor()
-    test_compliance_matrix()
-    test_proposal_structure()
-    test_rfp_prompts()
-    test_rfp_orchestrator()
+    sys.stdout.write(BANNER)
+
+    warm_imports("rfp.compliance", "rfp.structure", "prompts_rfp", "agents", "agents.rfp_orchestrator")
+    run_parallel([
+        test_compliance_extractor,
+        test_compliance_matrix,
+        test_proposal_structure,
+        test_rfp_prompts,
+        test_rfp_orchestrator,
+        test_template_loading,
+    ])
 
     print("\n" + "=" * 60)
     print("Phase 2 Testing Complete")
@@ -6,10 +6,14 @@ Test DOCX and PDF generation capabilities
 
 import sys
 import os
-from datetime import datetime
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from test_fixtures import MOCK_STATES
+from test_utils import banner, ensure_dirs, file_size, record_failure, run_dag, warm_imports
+
+BANNER = banner("KPLW Phase 3 Test Suite", "DOCX & PDF Output Generation")
+
 
 def test_docx_generator():
     """Test DOCX generator."""
@@ -20,76 +24,6 @@ def test_docx_generator():
     try:
         from rfp.generators.docx_generator import DOCXGenerator, DocumentStyle
 
-        # Create mock state
-        state = {
-            "project_id": "TEST-RFP-001",
-            "status": "valide",
-            "rana_score": 85,
-            "compliance_score": 92.5,
-            "requirements_count": 15,
-            "iteration_count": 2,
-            "timbo_analysis": """# TIMBO Strategic Analysis
-
-## Executive Summary
-This is a test analysis conducted by TIMBO agent.
-
-## Key Findings
-- Strategic alignment identified
-- Risk assessment completed
-- Win strategy developed
-
-## Recommendations
-1. Proceed with proposal
-2. Focus on differentiators
-3. Address compliance gaps
-""",
-            "zat_blueprint": """# ZAT Proposal Blueprint
-
-## Structure Design
-- Template: Government of Canada
-- Sections: 11 required sections
-- Page limits: Adhered to all limits
-
-## Compliance Mapping
-All requirements mapped to appropriate sections.
-""",
-            "mary_deliverable": """# MARY Proposal Content
-
-## Executive Summary
-This proposal presents our comprehensive solution.
-
-## Technical Approach
-### Architecture
-Our solution leverages modern architecture patterns.
-
-### Implementation
-- Phase 1: Design
-- Phase 2: Development
-- Phase 3: Testing
-
-## Team Qualifications
-Our team has 10+ years experience.
-""",
-            "rana_evaluation": """# RANA Quality Evaluation
-
-## Overall Score: 85/100
-
-### Strengths
-- Strong technical approach
-- Comprehensive compliance
-- Professional presentation
-
-### Areas for Improvement
-- Minor formatting issues
-- Some sections could be expanded
-
-## Recommendation: VALIDE
-""",
-            "compliance_matrix": "# Compliance Matrix\n\nAll requirements addressed.",
-            "requirements": [],
-            "compliance_gaps": []
-        }
-
         # Create custom style
         style = DocumentStyle(
             company_name="KPLW Strategic Innovations Inc.",
@@ -100,16 +34,15 @@ Our team has 10+ years experience.
         # Generate DOCX
         generator = DOCXGenerator(style=style)
         output_path = "outputs/TEST_PROPOSAL.docx"
-        os.makedirs("outputs", exist_ok=True)
 
         print("  Generating DOCX document...")
-        result_path = generator.generate(state, output_path, "government_canada")
+        result_path = generator.generate(MOCK_STATES["full"], output_path, "government_canada")
 
-        if os.path.exists(result_path):
-            file_size = os.path.getsize(result_path)
+        size = file_size(result_path)
+        if size is not None:
             print(f"✓ DOCX generated successfully")
             print(f"  - Path: {result_path}")
-            print(f"  - Size: {file_size:,} bytes")
+            print(f"  - Size: {size:,} bytes")
         else:
             print("✗ DOCX generation failed")
 
@@ -118,8 +51,7 @@ Our team has 10+ years experience.
         print("  Install: pip install python-docx")
     except Exception as e:
         print(f"✗ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        record_failure(e)
 
 
 def test_pdf_generator():
@@ -145,11 +77,11 @@ def test_pdf_generator():
                 print(f"  Converting DOCX to PDF...")
                 result_path = generator.generate_from_docx(docx_path, pdf_path)
 
-                if os.path.exists(result_path):
-                    file_size = os.path.getsize(result_path)
+                size = file_size(result_path)
+                if size is not None:
                     print(f"✓ PDF generated successfully")
                     print(f"  - Path: {result_path}")
-                    print(f"  - Size: {file_size:,} bytes")
+                    print(f"  - Size: {size:,} bytes")
                 else:
                     print("✗ PDF generation failed")
             else:
@@ -164,8 +96,7 @@ def test_pdf_generator():
 
     except Exception as e:
         print(f"✗ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        record_failure(e)
 
 
 def test_document_styles():
@@ -211,30 +142,11 @@ def test_end_to_end_generation():
         from rfp.generators.docx_generator import DOCXGenerator
         from rfp.generators.pdf_generator import PDFGenerator
 
-        # Mock minimal state
-        state = {
-            "project_id": "E2E-TEST-001",
-            "status": "valide",
-            "rana_score": 90,
-            "compliance_score": 95.0,
-            "requirements_count": 10,
-            "iteration_count": 1,
-            "timbo_analysis": "# Test Analysis\nTest content.",
-            "zat_blueprint": "# Test Blueprint\nTest content.",
-            "mary_deliverable": "# Test Proposal\nTest content.",
-            "rana_evaluation": "# Test Evaluation\nScore: 90/100",
-            "compliance_matrix": "# Test Matrix",
-            "requirements": [],
-            "compliance_gaps": []
-        }
-
-        os.makedirs("outputs", exist_ok=True)
-
         # Generate DOCX
         print("  Step 1: Generate DOCX...")
         docx_gen = DOCXGenerator()
         docx_path = "outputs/E2E_TEST.docx"
-        docx_gen.generate(state, docx_path, "corporate")
+        docx_gen.generate(MOCK_STATES["minimal"], docx_path, "corporate")
         print(f"  ✓ DOCX created: {docx_path}")
 
         # Generate PDF
@@ -252,8 +164,7 @@ def test_end_to_end_generation():
 
     except Exception as e:
         print(f"✗ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        record_failure(e)
 
 
 def test_integration_with_rfp_workflow():
@@ -283,19 +194,35 @@ def test_integration_with_rfp_workflow():
 
 def main():
     """Run all Phase 3 tests."""
-    print("\n")
-    print("╔" + "=" * 58 + "╗")
-    print("║" + " " * 58 + "║")
-    print("║" + "  KPLW Phase 3 Test Suite".center(58) + "║")
-    print("║" + "  DOCX & PDF Output Generation".center(58) + "║")
-    print("║" + " " * 58 + "║")
-    print("╚" + "=" * 58 + "╝")
-
-    test_docx_generator()
-    test_pdf_generator()
-    test_document_styles()
-    test_end_to_end_generation()
-    test_integration_with_rfp_workflow()
+    sys.stdout.write(BANNER)
+
+    # PDF conversion reads the DOCX from TEST 1, so it waits for that test.
+    # The rest write disjoint files and start straight away; each worker
+    # process has its own LibreOffice profile, so the two PDF tests can overlap
+    warm_imports("rfp.generators.docx_generator", "rfp.generators.pdf_generator")
+    ensure_dirs("outputs")
+
+    # Both PDF tests share one warm LibreOffice listener when soffice and
+    # unoconv are installed; otherwise each conversion uses the default path.
+    # An import failure here is left for the tests themselves to report
+    try:
+        from rfp.generators.pdf_generator import start_soffice_daemon
+        start_soffice_daemon()
+    except Exception:
+        pass
+
+    run_dag(
+        [
+            test_docx_generator,
+            test_pdf_generator,
+            test_document_styles,
+            test_end_to_end_generation,
+            test_integration_with_rfp_workflow,
+        ],
+        depends_on={
+            test_pdf_generator: [test_docx_generator],
+        },
+    )
 
     print("\n" + "=" * 60)
     print("Phase 3 Testing Complete")
@@ -4,13 +4,110 @@ Phase 4 Test Script
 Test FastAPI endpoints and Web UI functionality
 """
 
+import re
 import sys
+import json
+import mmap
+import atexit
+import hashlib
+import shutil
+import asyncio
 import os
 import time
+import tempfile
+import functools
+import contextlib
+import importlib.util
 from pathlib import Path
+from importlib.metadata import PackageNotFoundError, version
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from test_utils import banner, ensure_dirs, record_failure, run_concurrent, warm_imports
+
+BANNER = banner("KPLW Phase 4 Test Suite", "Web UI & REST API")
+
+# Returned by a test whose dependencies are not installed; not a pass
+SKIPPED = "skipped"
+
+
+@functools.lru_cache(maxsize=None)
+def _snapshot(root):
+    """Scan a directory once, mapping entry names to cached os.DirEntry objects."""
+    try:
+        with os.scandir(root) as entries:
+            return {entry.name: entry for entry in entries}
+    except FileNotFoundError:
+        return {}
+
+
+@functools.lru_cache(maxsize=1)
+def _api_module():
+    """Import api.main once; the FastAPI app graph is built a single time."""
+    try:
+        from api import main as api_main
+    except SystemExit as e:
+        # api.main exits when FastAPI is missing; report it like an import error
+        raise ImportError(f"api.main exited during import (code {e.code})") from None
+    return api_main
+
+
+@functools.lru_cache(maxsize=1)
+def _route_paths():
+    """Route paths of the shared app, derived once."""
+    return tuple(route.path for route in _api_module().app.routes)
+
+
+def _get_in_process(*paths):
+    """
+    GET paths concurrently through the app's ASGI interface.
+
+    Requests never touch a socket or a uvicorn process. Returns the
+    responses in order; raises ImportError when httpx is not installed.
+    """
+    import httpx
+
+    async def probe():
+        transport = httpx.ASGITransport(app=_api_module().app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(client.get(path) for path in paths))
+
+    return asyncio.run(probe())
+
+
+@functools.lru_cache(maxsize=1)
+def _web_module():
+    """
+    Import web.server once, with its upload and output directories moved to
+    a scratch directory and background job processing switched off.
+    """
+    from web import server
+
+    scratch = Path(tempfile.mkdtemp(prefix="kplw-web-"))
+    atexit.register(shutil.rmtree, scratch, ignore_errors=True)
+    server.UPLOAD_DIR = scratch / "uploads"
+    server.BLOB_DIR = server.UPLOAD_DIR / "blobs"
+    server.OUTPUT_DIR = scratch / "outputs"
+    ensure_dirs(server.BLOB_DIR, server.OUTPUT_DIR)
+
+    async def no_processing(job_id):
+        pass
+
+    server.process_rfp_job = no_processing
+    return server
+
+
+def _web_client(server):
+    """httpx client talking to the web UI app in-process."""
+    import httpx
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://test")
+
+
+def _check(ok, label):
+    """Print one ✓/✗ line and pass the outcome through."""
+    print(f"{'✓' if ok else '✗'} {label}")
+    return bool(ok)
+
 
 def test_fastapi_import():
     """Test FastAPI dependencies are installed."""
@@ -18,19 +115,22 @@ def test_fastapi_import():
     print("TEST 1: FastAPI Dependencies")
     print("=" * 60)
 
-    try:
-        import fastapi
-        import uvicorn
-        from fastapi import File, UploadFile
-        import websockets
-
-        print(f"✓ FastAPI installed: v{fastapi.__version__}")
-        print(f"✓ Uvicorn installed: v{uvicorn.__version__}")
-        print(f"✓ WebSockets installed")
-        print(f"✓ File upload support available")
-
-    except ImportError as e:
-        print(f"✗ Import error: {e}")
+    # Installed-package metadata is enough here; the app itself is imported
+    # once by the tests that need it
+    missing = []
+    for package, label in (
+        ("fastapi", "FastAPI"),
+        ("uvicorn", "Uvicorn"),
+        ("websockets", "WebSockets"),
+        ("python-multipart", "File upload support (python-multipart)"),
+    ):
+        try:
+            print(f"✓ {label} installed: v{version(package)}")
+        except PackageNotFoundError:
+            missing.append(package)
+            print(f"✗ {label} not installed")
+
+    if missing:
         print("  Install: pip install fastapi uvicorn[standard] python-multipart websockets")
         return False
 
@@ -44,7 +144,7 @@ def test_api_structure():
     print("=" * 60)
 
     try:
-        from api import main as api_main
+        api_main = _api_module()
 
         print("✓ API module imported")
 
@@ -53,7 +153,7 @@ def test_api_structure():
             print("✓ FastAPI app instance found")
 
             # Check routes
-            routes = [route.path for route in api_main.app.routes]
+            routes = _route_paths()
             expected_routes = [
                 "/",
                 "/health",
@@ -81,8 +181,7 @@ def test_api_structure():
 
     except Exception as e:
         print(f"✗ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        record_failure(e)
         return False
 
     return True
@@ -97,24 +196,25 @@ def test_web_ui_files():
     web_dir = Path("web")
     index_file = web_dir / "index.html"
 
-    if not web_dir.exists():
+    root_entry = _snapshot(".").get(web_dir.name)
+    if root_entry is None or not root_entry.is_dir():
         print(f"✗ Web directory not found: {web_dir}")
         return False
 
     print(f"✓ Web directory exists: {web_dir}")
 
-    if not index_file.exists():
+    index_entry = _snapshot(str(web_dir)).get(index_file.name)
+    if index_entry is None:
         print(f"✗ Index file not found: {index_file}")
         return False
 
     print(f"✓ Index file exists: {index_file}")
 
-    # Check file size
-    file_size = index_file.stat().st_size
+    # Check file size (DirEntry caches the stat result)
+    file_size = index_entry.stat().st_size
     print(f"✓ Index file size: {file_size:,} bytes")
 
     # Check for key HTML elements
-    content = index_file.read_text()
     required_elements = [
         "KPLW RFP Generator",
         "upload-section",
@@ -124,8 +224,16 @@ def test_web_ui_files():
         "fetch('/api/"
     ]
 
+    # Single pass over the mapped bytes for all needles (no decode or copy);
+    # the lookahead lets matches overlap
+    pattern = re.compile(b"(?=(" + b"|".join(re.escape(e.encode()) for e in required_elements) + b"))")
+    found = set()
+    if file_size:
+        with open(index_entry.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            found = {match.group(1).decode() for match in pattern.finditer(mm)}
+
     for element in required_elements:
-        if element in content:
+        if element in found:
             print(f"✓ Found: {element}")
         else:
             print(f"✗ Missing: {element}")
@@ -139,16 +247,17 @@ def test_docker_files():
     print("TEST 4: Docker Configuration")
     print("=" * 60)
 
-    dockerfile = Path("Dockerfile")
-    docker_compose = Path("docker-compose.yml")
-    dockerignore = Path(".dockerignore")
+    snapshot = _snapshot(".")
+    dockerfile = snapshot.get("Dockerfile")
+    docker_compose = snapshot.get("docker-compose.yml")
+    dockerignore = snapshot.get(".dockerignore")
 
     files_ok = True
 
-    if dockerfile.exists():
+    if dockerfile is not None:
         print(f"✓ Dockerfile exists ({dockerfile.stat().st_size} bytes)")
 
-        content = dockerfile.read_text()
+        content = Path(dockerfile.path).read_text()
         if "FROM python:" in content:
             print("  ✓ Base image specified")
         if "uvicorn" in content:
@@ -159,10 +268,10 @@ def test_docker_files():
         print("✗ Dockerfile not found")
         files_ok = False
 
-    if docker_compose.exists():
+    if docker_compose is not None:
         print(f"✓ docker-compose.yml exists ({docker_compose.stat().st_size} bytes)")
 
-        content = docker_compose.read_text()
+        content = Path(docker_compose.path).read_text()
         if "api:" in content:
             print("  ✓ API service defined")
         if "8000:8000" in content:
@@ -173,7 +282,7 @@ def test_docker_files():
         print("✗ docker-compose.yml not found")
         files_ok = False
 
-    if dockerignore.exists():
+    if dockerignore is not None:
         print(f"✓ .dockerignore exists ({dockerignore.stat().st_size} bytes)")
     else:
         print("✗ .dockerignore not found")
@@ -189,7 +298,7 @@ def test_api_server_startup():
     print("=" * 60)
 
     try:
-        from api.main import app
+        app = _api_module().app
 
         print("✓ FastAPI app loaded successfully")
 
@@ -199,21 +308,32 @@ def test_api_server_startup():
         print(f"  - Description: {app.description}")
 
         # Count routes
-        routes = [route for route in app.routes]
+        routes = _route_paths()
         print(f"  - Routes: {len(routes)} endpoints")
 
         # Check middleware
         middleware_count = len(app.user_middleware)
         print(f"  - Middleware: {middleware_count} configured")
 
+        # Exercise real endpoints in-process
+        try:
+            responses = _get_in_process("/health", "/api/templates")
+        except ImportError as e:
+            print(f"  ⊘ Skipping endpoint probe, dependency not installed: {e}")
+        else:
+            for response in responses:
+                print(f"  - GET {response.url.path}: {response.status_code}")
+            if any(response.status_code != 200 for response in responses):
+                print("✗ Endpoint probe failed")
+                return False
+
         print("\n✓ API server configuration valid")
         print("  To start server: uvicorn api.main:app --reload")
         print("  Or with Docker: docker-compose up")
 
     except Exception as e:
         print(f"✗ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        record_failure(e)
         return False
 
     return True
@@ -227,68 +347,418 @@ def test_integration():
 
     try:
         # Check API can import RFP orchestrator
-        from api.main import RFPOrchestrator
+        api_main = _api_module()
+        if not hasattr(api_main, "RFPOrchestrator"):
+            print("✗ API does not import RFPOrchestrator")
+            return False
 
         print("✓ API can import RFPOrchestrator")
 
         # Check API can access templates
-        from api.main import list_templates
-
-        templates = list_templates()
+        templates = api_main.list_templates()
         print(f"✓ API can access {len(templates)} templates")
 
+        try:
+            responses = _get_in_process("/api/templates")
+        except ImportError as e:
+            print(f"⊘ Skipping /api/templates probe, dependency not installed: {e}")
+        else:
+            served = responses[0].json()["templates"]
+            if len(served) != len(templates):
+                print(f"✗ /api/templates serves {len(served)} of {len(templates)} templates")
+                return False
+            print(f"✓ /api/templates serves all {len(served)} templates")
+
         # Check paths
-        from api.main import UPLOAD_DIR, OUTPUT_DIR
+        UPLOAD_DIR, OUTPUT_DIR = api_main.UPLOAD_DIR, api_main.OUTPUT_DIR
 
         print(f"✓ Upload directory configured: {UPLOAD_DIR}")
         print(f"✓ Output directory configured: {OUTPUT_DIR}")
 
-        # Check directories exist
-        UPLOAD_DIR.mkdir(exist_ok=True)
-        OUTPUT_DIR.mkdir(exist_ok=True)
+        # Created once by main() before the tests run
+        if not (UPLOAD_DIR.is_dir() and OUTPUT_DIR.is_dir()):
+            print("✗ Upload/output directories missing")
+            return False
 
         print("✓ Directories created successfully")
 
     except Exception as e:
         print(f"✗ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        record_failure(e)
         return False
 
     return True
 
 
+async def _upload_checks(server):
+    checks = []
+    async with _web_client(server) as client:
+        response = await client.post("/api/rfp/upload", files=[
+            ("files", ("../../rfp.md", b"# RFP")),
+            ("cv_files", ("cv.md", b"# CV")),
+        ])
+        checks.append(_check(response.status_code == 200, f"Multipart upload accepted ({response.status_code})"))
+        job_dir = server.UPLOAD_DIR / response.json()["job_id"]
+        checks.append(_check(
+            sorted(os.listdir(job_dir)) == ["cv_cv.md", "manifest.json", "rfp.md"],
+            "Uploads stored flat in the job directory, with a manifest"
+        ))
+
+        # Same content is stored once; a repeated name is kept, not overwritten
+        response = await client.post("/api/rfp/upload", files=[
+            ("files", ("rfp.md", b"same bytes")),
+            ("files", ("rfp.md", b"same bytes")),
+        ])
+        job_dir = server.UPLOAD_DIR / response.json()["job_id"]
+        first, second = job_dir / "rfp.md", job_dir / "rfp (2).md"
+        checks.append(_check(
+            second.exists() and os.stat(first).st_ino == os.stat(second).st_ino,
+            "Identical uploads share one stored blob"
+        ))
+        manifest = json.loads((job_dir / "manifest.json").read_text(encoding="utf-8"))
+        digest = hashlib.sha256(b"same bytes").hexdigest()
+        checks.append(_check(
+            manifest == {name: {"filename": "rfp.md", "sha256": digest} for name in ("rfp.md", "rfp (2).md")},
+            "Manifest maps stored names to original names and SHA-256"
+        ))
+
+        # Only "no hard links here" falls back to a copy; a name clash is an error
+        try:
+            server.link_blob(server.BLOB_DIR / digest, first)
+            checks.append(_check(False, "Linking over an existing upload raises"))
+        except FileExistsError:
+            checks.append(_check(True, "Linking over an existing upload raises"))
+
+        # Pruning drops old blobs no job links to, and keeps linked ones
+        orphan = server.BLOB_DIR / hashlib.sha256(b"orphan").hexdigest()
+        orphan.write_bytes(b"orphan")
+        os.utime(orphan, (0, 0))
+        os.utime(server.BLOB_DIR / digest, (0, 0))
+        removed = server.prune_blobs()
+        checks.append(_check(
+            removed == 1 and not orphan.exists() and (server.BLOB_DIR / digest).exists(),
+            f"Unlinked blobs pruned, linked blobs kept ({removed} removed)"
+        ))
+
+        # A body cut off mid-part is rejected, leaving no job or temp file
+        jobs_before = set(os.listdir(server.UPLOAD_DIR))
+        truncated = (
+            b'--B\r\nContent-Disposition: form-data; name="files"; filename="a.md"\r\n\r\nfirst\r\n'
+            b'--B\r\nContent-Disposition: form-data; name="files"; filename="b.md"\r\n\r\nsecond, unfinished'
+        )
+        response = await client.post("/api/rfp/upload", content=truncated,
+                                     headers={"content-type": "multipart/form-data; boundary=B"})
+        checks.append(_check(response.status_code == 400, f"Truncated multipart body rejected ({response.status_code})"))
+        checks.append(_check(
+            set(os.listdir(server.UPLOAD_DIR)) == jobs_before
+            and not any(name.startswith(".upload-") for name in os.listdir(server.BLOB_DIR)),
+            "Truncated upload cleaned up"
+        ))
+
+        # A body that is not valid multipart is a client error, not a 500
+        response = await client.post("/api/rfp/upload", content=b"--NOT-THE-BOUNDARY\r\n\r\n",
+                                     headers={"content-type": "multipart/form-data; boundary=B"})
+        checks.append(_check(response.status_code == 400, f"Malformed multipart body rejected ({response.status_code})"))
+
+        # A stalled client holds no upload slot and is dropped after the read timeout
+        async def stalled_body():
+            yield b'--B\r\nContent-Disposition: form-data; name="files"; filename="a.md"\r\n\r\nfirst'
+            await asyncio.sleep(1)
+            yield b"\r\n--B--\r\n"
+
+        free_slots = []
+
+        async def watch_slots():
+            await asyncio.sleep(0.1)
+            free_slots.append(server.upload_slots_free())
+
+        # Waiting for a busy upload slot is not a stall
+        async def hold_all_slots(started):
+            async with contextlib.AsyncExitStack() as stack:
+                for _ in range(server.UPLOAD_CONCURRENCY):
+                    await stack.enter_async_context(server.upload_slot())
+                started.set()
+                await asyncio.sleep(0.6)
+
+        async def upload_when_busy(started):
+            await started.wait()
+            return await client.post("/api/rfp/upload", files=[("files", ("rfp.md", b"# RFP"))])
+
+        read_timeout, server.UPLOAD_READ_TIMEOUT = server.UPLOAD_READ_TIMEOUT, 0.3
+        try:
+            response, _ = await asyncio.gather(
+                client.post("/api/rfp/upload", content=stalled_body(),
+                            headers={"content-type": "multipart/form-data; boundary=B"}),
+                watch_slots(),
+            )
+            started = asyncio.Event()
+            _, busy_response = await asyncio.gather(hold_all_slots(started), upload_when_busy(started))
+        finally:
+            server.UPLOAD_READ_TIMEOUT = read_timeout
+        checks.append(_check(free_slots == [server.UPLOAD_CONCURRENCY], "Stalled upload holds no upload slot"))
+        checks.append(_check(response.status_code == 408, f"Stalled upload dropped ({response.status_code})"))
+        checks.append(_check(
+            busy_response.status_code == 200,
+            f"Upload waiting for a busy slot not timed out ({busy_response.status_code})"
+        ))
+
+        # Oversized bodies get 413, declared up front or counted as they stream
+        max_bytes, server.MAX_UPLOAD_BYTES = server.MAX_UPLOAD_BYTES, 64 * 1024
+        try:
+            oversized = (
+                b'--B\r\nContent-Disposition: form-data; name="files"; filename="big.md"\r\n\r\n'
+                + b"x" * 256 * 1024 + b"\r\n--B--\r\n"
+            )
+
+            async def chunked_body():
+                for start in range(0, len(oversized), 16 * 1024):
+                    yield oversized[start:start + 16 * 1024]
+
+            jobs_before = set(os.listdir(server.UPLOAD_DIR))
+            responses = [
+                await client.post("/api/rfp/upload", content=body, headers={
+                    "content-type": "multipart/form-data; boundary=B",
+                    "origin": "http://other.example",
+                })
+                for body in (oversized, chunked_body())
+            ]
+        finally:
+            server.MAX_UPLOAD_BYTES = max_bytes
+        statuses = [response.status_code for response in responses]
+        checks.append(_check(statuses == [413, 413], f"Oversized uploads rejected, sized and chunked ({statuses})"))
+        checks.append(_check(
+            all("access-control-allow-origin" in response.headers for response in responses),
+            "413 responses carry CORS headers"
+        ))
+        checks.append(_check(set(os.listdir(server.UPLOAD_DIR)) == jobs_before, "Oversized uploads cleaned up"))
+
+        # Multi-byte names are cut by UTF-8 length, under the 255-byte limit
+        long_name = "😀" * 200 + ".pdf"
+        stored = server.safe_filename(long_name)
+        checks.append(_check(
+            len(("cv_" + stored).encode("utf-8")) <= 255 and stored.endswith(".pdf"),
+            f"Long non-ASCII filename shortened to {len(stored.encode('utf-8'))} bytes"
+        ))
+        response = await client.post("/api/rfp/upload", files=[
+            ("files", (long_name, b"%PDF")),
+            ("cv_files", (long_name, b"%PDF")),
+        ])
+        checks.append(_check(response.status_code == 200, f"Long non-ASCII filename uploaded ({response.status_code})"))
+    return checks
+
+
+def test_web_uploads():
+    """Test the web UI's streaming upload endpoint."""
+    print("\n" + "=" * 60)
+    print("TEST 7: Web UI Uploads")
+    print("=" * 60)
+
+    if importlib.util.find_spec("httpx") is None:
+        print("⊘ Skipping, dependency not installed: httpx")
+        return SKIPPED
+
+    try:
+        server = _web_module()
+        checks = [
+            _check(server.safe_filename("..\\..\\evil.md") == "evil.md", "safe_filename drops directories"),
+            _check(server.safe_filename("a\x07b.md") == "ab.md", "safe_filename drops control characters"),
+        ]
+        checks += asyncio.run(_upload_checks(server))
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        record_failure(e)
+        return False
+
+    return all(checks)
+
+
+async def _download_checks(server):
+    checks = []
+    data = bytes(range(256)) * 64
+    report = ("# Rapport\n" + "Ligne de rapport répétée\n" * 200).encode("utf-8")
+    (server.OUTPUT_DIR / "WEBTEST_PROPOSAL.pdf").write_bytes(data)
+    (server.OUTPUT_DIR / "WEBTEST_RAPPORT_COMPLET.md").write_bytes(report)
+    job_id = await server.job_manager.create_job([], [], "corporate", ["md", "pdf"])
+    await server.job_manager.update_job(job_id, status="completed", result={"project_id": "WEBTEST"})
+    url = f"/api/rfp/download/{job_id}"
+
+    async with _web_client(server) as client:
+        response = await client.get(f"{url}/pdf")
+        checks.append(_check(
+            response.status_code == 200 and response.content == data
+            and response.headers.get("accept-ranges") == "bytes" and "content-encoding" not in response.headers,
+            "PDF served whole, uncompressed, with Accept-Ranges"
+        ))
+        response = await client.get(f"{url}/pdf", headers={"Range": "bytes=100-199"})
+        checks.append(_check(
+            response.status_code == 206 and response.content == data[100:200]
+            and response.headers.get("content-range") == f"bytes 100-199/{len(data)}",
+            f"Byte range served as 206 ({response.status_code})"
+        ))
+        response = await client.get(f"{url}/pdf", headers={"Range": f"bytes={len(data)}-"})
+        checks.append(_check(
+            response.status_code == 416 and response.headers.get("content-range") == f"bytes */{len(data)}",
+            f"Unsatisfiable range rejected with 416 ({response.status_code})"
+        ))
+
+        response = await client.get(f"{url}/md", headers={"Accept-Encoding": "gzip"})
+        checks.append(_check(
+            response.headers.get("content-encoding") == "gzip" and response.content == report,
+            "Markdown report gzipped"
+        ))
+        response = await client.get(f"{url}/md", headers={"Accept-Encoding": "gzip", "Range": "bytes=0-9"})
+        checks.append(_check(
+            response.status_code == 206 and "content-encoding" not in response.headers
+            and response.content == report[:10],
+            "Ranged Markdown request served uncompressed"
+        ))
+        response = await client.get(f"{url}/xls")
+        checks.append(_check(response.status_code == 400, f"Unknown file type rejected ({response.status_code})"))
+
+        response = await client.get("/api/templates")
+        etag = response.headers.get("etag")
+        cached = await client.get("/api/templates", headers={"If-None-Match": etag or ""})
+        checks.append(_check(
+            response.status_code == 200 and etag and cached.status_code == 304,
+            f"Templates revalidated by ETag ({cached.status_code})"
+        ))
+    return checks
+
+
+def test_web_downloads():
+    """Test the web UI's downloads, compression and caching."""
+    print("\n" + "=" * 60)
+    print("TEST 8: Web UI Downloads & Caching")
+    print("=" * 60)
+
+    if importlib.util.find_spec("httpx") is None:
+        print("⊘ Skipping, dependency not installed: httpx")
+        return SKIPPED
+
+    try:
+        server = _web_module()
+        checks = [
+            _check(server.parse_range("bytes=0-9", 100) == (0, 9), "parse_range: explicit range"),
+            _check(server.parse_range("bytes=-5", 100) == (95, 99), "parse_range: suffix range"),
+            _check(server.parse_range("bytes=90-500", 100) == (90, 99), "parse_range: end clamped to file size"),
+            _check(server.parse_range("bytes=0-1,5-6", 100) is None, "parse_range: multiple ranges serve the whole file"),
+        ]
+        checks += asyncio.run(_download_checks(server))
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        record_failure(e)
+        return False
+
+    return all(checks)
+
+
+async def _coalesce_checks(coalesce):
+    async def burst():
+        for update in ("10", "20", "30"):
+            yield update
+        await asyncio.sleep(0.2)
+        for update in ("30", "40"):
+            yield update
+
+    sent = [update async for update in coalesce(burst(), window=0.05)]
+    return [_check(sent == ["30", "40"], f"Progress burst coalesced to the latest update per window ({sent})")]
+
+
+def test_web_progress():
+    """Test progress coalescing and the progress WebSocket."""
+    print("\n" + "=" * 60)
+    print("TEST 9: Web UI Progress WebSocket")
+    print("=" * 60)
+
+    try:
+        from starlette.testclient import TestClient
+    except ImportError as e:
+        print(f"⊘ Skipping, dependency not installed: {e}")
+        return SKIPPED
+
+    try:
+        server = _web_module()
+        from web.progress import coalesce
+        checks = asyncio.run(_coalesce_checks(coalesce))
+
+        with TestClient(server.app) as client, client.websocket_connect("/ws/rfp/WEBTEST") as websocket:
+            websocket.send_text("ping")
+            checks.append(_check(websocket.receive_text() == "pong", "Client ping answered with pong"))
+
+            client.portal.call(server.job_manager.send_progress, "WEBTEST", 50, "Halfway")
+            update = json.loads(websocket.receive_text())
+            checks.append(_check(update == {"progress": 50, "message": "Halfway"}, f"Progress relayed: {update}"))
+
+            # Keepalive is left to protocol-level ping frames: a client that
+            # stays silent still gets nothing but progress JSON
+            time.sleep(0.3)
+            client.portal.call(server.job_manager.send_progress, "WEBTEST", 100, "Complete!")
+            update = json.loads(websocket.receive_text())
+            checks.append(_check(
+                update == {"progress": 100, "message": "Complete!"},
+                "Silent client kept, only progress JSON sent"
+            ))
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        record_failure(e)
+        return False
+
+    return all(checks)
+
+
 def main():
     """Run all Phase 4 tests."""
-    print("\n")
-    print("╔" + "=" * 58 + "╗")
-    print("║" + " " * 58 + "║")
-    print("║" + "  KPLW Phase 4 Test Suite".center(58) + "║")
-    print("║" + "  Web UI & REST API".center(58) + "║")
-    print("║" + " " * 58 + "║")
-    print("╚" + "=" * 58 + "╝")
-
-    results = []
-
-    results.append(("FastAPI Dependencies", test_fastapi_import()))
-    results.append(("API Module Structure", test_api_structure()))
-    results.append(("Web UI Files", test_web_ui_files()))
-    results.append(("Docker Configuration", test_docker_files()))
-    results.append(("API Server Startup", test_api_server_startup()))
-    results.append(("Component Integration", test_integration()))
+    sys.stdout.write(BANNER)
+
+    tests = [
+        ("FastAPI Dependencies", test_fastapi_import),
+        ("API Module Structure", test_api_structure),
+        ("Web UI Files", test_web_ui_files),
+        ("Docker Configuration", test_docker_files),
+        ("API Server Startup", test_api_server_startup),
+        ("Component Integration", test_integration),
+    ]
+    web_tests = [
+        ("Web UI Uploads", test_web_uploads),
+        ("Web UI Downloads & Caching", test_web_downloads),
+        ("Web UI Progress WebSocket", test_web_progress),
+    ]
+    warm_imports("api.main", "web.server")
+    try:
+        _route_paths()
+        api_main = _api_module()
+        ensure_dirs(api_main.UPLOAD_DIR, api_main.OUTPUT_DIR)
+    except (Exception, SystemExit):
+        pass  # reported by the tests themselves
+    try:
+        _web_module()
+    except Exception:
+        pass  # reported by the tests themselves
+
+    # The web UI tests share one patched web.server and change its limits
+    # while they run, so they go one after another on a single thread
+    def run_web_tests():
+        return [test() for _, test in web_tests]
+
+    # Stats, file reads and in-process HTTP probes: threads are enough
+    *outcomes, web_outcomes = run_concurrent([test for _, test in tests] + [run_web_tests])
+    outcomes += web_outcomes or [False] * len(web_tests)
+    tests += web_tests
+    results = [(name, outcome) for (name, _), outcome in zip(tests, outcomes)]
 
     print("\n" + "=" * 60)
     print("Phase 4 Testing Complete")
     print("=" * 60)
 
     # Summary
-    passed = sum(1 for _, result in results if result)
+    passed = sum(1 for _, result in results if result and result is not SKIPPED)
+    skipped = sum(1 for _, result in results if result is SKIPPED)
     total = len(results)
 
-    print(f"\nResults: {passed}/{total} tests passed")
+    print(f"\nResults: {passed}/{total} tests passed" + (f", {skipped} skipped" if skipped else ""))
 
     for test_name, result in results:
-        status = "✓ PASS" if result else "✗ FAIL"
+        status = "⊘ SKIP" if result is SKIPPED else "✓ PASS" if result else "✗ FAIL"
         print(f"  {status}: {test_name}")
 
     print("\n" + "=" * 60)
@@ -0,0 +1,244 @@
+"""
+Shared helpers for the phase test scripts
+Run independent test functions concurrently with ordered output
+"""
+
+import io
+import os
+import sys
+import asyncio
+import threading
+import compileall
+import importlib
+import traceback
+import contextlib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Formatted tracebacks recorded by the tests in this process
+_TRACEBACKS = []
+
+
+def banner(title, subtitle):
+    """Build a test suite's boxed banner once, as a single string."""
+    bar, pad = "=" * 58, " " * 58
+    return (
+        f"\n\n╔{bar}╗\n║{pad}║\n"
+        f"║{'  ' + title:^58}║\n║{'  ' + subtitle:^58}║\n"
+        f"║{pad}║\n╚{bar}╝\n"
+    )
+
+
+def warm_imports(*modules):
+    """
+    Import heavy modules once in the parent before workers start.
+
+    Forked workers inherit the already-initialised modules, so the inline
+    imports inside each test become sys.modules lookups. The packages are
+    byte-compiled first so spawn-based platforms also load from .pyc.
+    Import errors are left for the tests themselves to report.
+    """
+    for package in dict.fromkeys(module.split(".")[0] for module in modules):
+        package_dir = os.path.join(ROOT_DIR, package)
+        if os.path.isdir(package_dir):
+            compileall.compile_dir(package_dir, quiet=1)
+
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except (Exception, SystemExit):
+            pass
+
+
+def ensure_dirs(*paths):
+    """Create every output directory the tests write to, once, up front."""
+    for path in dict.fromkeys(map(os.fspath, paths)):
+        os.makedirs(path, exist_ok=True)
+
+
+def file_size(path):
+    """Return a file's size with a single stat call, or None if it is missing."""
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return None
+
+
+def record_failure(exc):
+    """Format an exception's traceback once and keep it for the end-of-run report."""
+    _TRACEBACKS.append("".join(traceback.format_exception(exc)))
+
+
+def drain_tracebacks():
+    """Return and clear the tracebacks recorded so far."""
+    tracebacks = _TRACEBACKS[:]
+    _TRACEBACKS.clear()
+    return tracebacks
+
+
+def print_tracebacks(tracebacks):
+    """Print recorded tracebacks after the test output, each distinct one once."""
+    unique = dict.fromkeys(tracebacks)
+    if unique:
+        sys.stdout.write("\n" + "=" * 60 + "\nTracebacks\n" + "=" * 60 + "\n" + "\n".join(unique))
+
+
+def _run_captured(test):
+    """Run a test with output buffered, returning (output, result, tracebacks)."""
+    drain_tracebacks()
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer):
+        result = test()
+    return buffer.getvalue(), result, drain_tracebacks()
+
+
+class ThreadLocalStdout:
+    """stdout proxy routing writes to a per-thread buffer while a test runs."""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def _target(self):
+        return getattr(self._local, "buffer", None) or self._stream
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+    def capture(self, test):
+        """Run a test with its output captured, returning (captured output, result)."""
+        self._local.buffer = io.StringIO()
+        try:
+            result = test()
+            return self._local.buffer.getvalue(), result
+        finally:
+            del self._local.buffer
+
+
+def run_concurrent(tests):
+    """
+    Run I/O-bound test functions concurrently on threads, in one process.
+
+    Each test runs via asyncio.to_thread with its output captured per thread;
+    outputs are printed in submission order once all tests have finished.
+    A test that raises is reported as failed with its traceback recorded.
+
+    Returns:
+        List of test return values, in the same order as tests
+    """
+    stdout = sys.stdout
+    proxy = ThreadLocalStdout(stdout)
+
+    async def gather():
+        return await asyncio.gather(
+            *(asyncio.to_thread(proxy.capture, test) for test in tests),
+            return_exceptions=True,
+        )
+
+    sys.stdout = proxy
+    try:
+        outcomes = asyncio.run(gather())
+    finally:
+        sys.stdout = stdout
+
+    results = []
+    for test, outcome in zip(tests, outcomes):
+        if isinstance(outcome, Exception):
+            record_failure(outcome)
+            stdout.write(f"\n✗ {test.__name__} raised: {outcome}\n")
+            results.append(False)
+        else:
+            output, result = outcome
+            stdout.write(output)
+            results.append(result)
+    print_tracebacks(drain_tracebacks())
+    return results
+
+
+def run_parallel(tests):
+    """
+    Run independent test functions in worker processes.
+
+    Each worker buffers its own output; the parent prints it in submission
+    order so the report reads like a sequential run.
+
+    Args:
+        tests: Module-level (picklable) test functions
+
+    Returns:
+        List of test return values, in the same order as tests
+    """
+    results, tracebacks = [], []
+    with ProcessPoolExecutor(max_workers=min(len(tests), os.cpu_count() or 1)) as executor:
+        futures = [executor.submit(_run_captured, test) for test in tests]
+        for future in futures:
+            output, result, test_tracebacks = future.result()
+            sys.stdout.write(output)
+            results.append(result)
+            tracebacks.extend(test_tracebacks)
+    print_tracebacks(tracebacks)
+    return results
+
+
+def run_dag(tests, depends_on=None):
+    """
+    Run test functions in worker processes, honouring dependencies.
+
+    Tests with no prerequisites start immediately; a dependent test is
+    submitted as soon as all of its prerequisites have finished. If a
+    prerequisite raises, its dependents are skipped and report False.
+    Output is printed in the order the tests were given.
+
+    Args:
+        tests: Module-level (picklable) test functions
+        depends_on: Mapping of test -> iterable of prerequisite tests
+
+    Returns:
+        List of test return values, in the same order as tests
+    """
+    depends_on = {test: set(deps) for test, deps in (depends_on or {}).items()}
+    unknown = [t.__name__ for test, deps in depends_on.items() for t in (test, *deps) if t not in tests]
+    if unknown:
+        raise ValueError(f"depends_on names tests that are not being run: {', '.join(unknown)}")
+
+    outcomes = {}  # test -> (output, result, tracebacks, completed)
+    with ProcessPoolExecutor(max_workers=min(len(tests), os.cpu_count() or 1)) as executor:
+        pending = {}
+        waiting = list(tests)
+        while waiting or pending:
+            progressed = False
+            for test in list(waiting):
+                deps = depends_on.get(test, ())
+                if any(dep in outcomes and not outcomes[dep][3] for dep in deps):
+                    waiting.remove(test)
+                    outcomes[test] = (f"\n⊘ Skipped {test.__name__}: prerequisite failed\n", False, [], False)
+                    progressed = True
+                elif all(dep in outcomes for dep in deps):
+                    waiting.remove(test)
+                    pending[executor.submit(_run_captured, test)] = test
+                    progressed = True
+            if not pending:
+                if waiting and not progressed:
+                    names = ", ".join(test.__name__ for test in waiting)
+                    raise ValueError(f"depends_on has a cycle between: {names}")
+                continue
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                test = pending.pop(future)
+                try:
+                    outcomes[test] = (*future.result(), True)
+                except Exception as e:
+                    outcomes[test] = (f"\n✗ {test.__name__} raised: {e}\n", False, [], False)
+
+    results, tracebacks = [], []
+    for test in tests:
+        output, result, test_tracebacks, _ = outcomes[test]
+        sys.stdout.write(output)
+        results.append(result)
+        tracebacks.extend(test_tracebacks)
+    print_tracebacks(tracebacks)
+    return results
@@ -0,0 +1,202 @@
+"""
+KPLW Job Progress Channel
+Publish job progress updates and relay them to WebSocket clients
+
+With REDIS_URL set, updates go through Redis pub/sub so any process (web
+server or Celery worker) can publish and any web server can forward.
+Otherwise they stay on in-process queues.
+"""
+
+import os
+import sys
+import json
+import asyncio
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Optional, Set
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import REDIS_URL
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import redis
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+def channel(job_id: str) -> str:
+    """Pub/sub channel name for a job."""
+    return f"job:{job_id}"
+
+
+def job_key(job_id: str) -> str:
+    """Redis hash holding a job's state (fields are JSON-encoded)."""
+    return f"job:{job_id}"
+
+
+# Progress ticks arriving within this window reach the client as one frame
+PROGRESS_FLUSH_INTERVAL = 0.05
+
+
+def encode_progress(progress: int, message: str) -> str:
+    """Serialize a progress update as the JSON text the web UI expects."""
+    update = {'progress': progress, 'message': message}
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(update).decode()
+    return json.dumps(update)
+
+
+async def coalesce(updates: AsyncIterator[str], window: float = PROGRESS_FLUSH_INTERVAL) -> AsyncIterator[str]:
+    """
+    Yield at most one update per window: the latest one.
+
+    Intermediate ticks are dropped, as are repeats of the last update sent,
+    so a chatty producer costs one WebSocket frame per window at most.
+    """
+    latest = None
+    finished = False
+    ready = asyncio.Event()
+
+    async def pump():
+        nonlocal latest, finished
+        try:
+            async for payload in updates:
+                latest = payload
+                ready.set()
+        finally:
+            finished = True
+            ready.set()
+
+    pump_task = asyncio.create_task(pump())
+    sent = None
+    try:
+        while True:
+            await ready.wait()
+            await asyncio.sleep(window)
+            ready.clear()
+            payload, latest = latest, None
+            if payload is not None and payload != sent:
+                sent = payload
+                yield payload
+            if finished and latest is None:
+                break
+        await pump_task  # re-raise whatever ended the producer
+    finally:
+        pump_task.cancel()
+
+
+class LocalProgressHub:
+    """Fan progress out to subscribers in this process."""
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    async def publish(self, job_id: str, payload: str):
+        for queue in self._subscribers.get(job_id, ()):
+            queue.put_nowait(payload)
+
+    async def subscribe(self, job_id: str) -> AsyncIterator[str]:
+        queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            subscribers = self._subscribers.get(job_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[job_id]
+
+
+class RedisProgressHub:
+    """Fan progress out through Redis pub/sub, across processes and hosts."""
+
+    def __init__(self, client):
+        self._redis = client
+
+    async def publish(self, job_id: str, payload: str):
+        await self._redis.publish(channel(job_id), payload)
+
+    async def subscribe(self, job_id: str) -> AsyncIterator[str]:
+        pubsub = self._redis.pubsub()
+        await pubsub.subscribe(channel(job_id))
+        try:
+            async for msg in pubsub.listen():
+                if msg['type'] == 'message':
+                    yield msg['data']
+        finally:
+            await pubsub.unsubscribe(channel(job_id))
+            # aclose() arrived in redis-py 5.0.1; older releases only have close()
+            await (getattr(pubsub, "aclose", None) or pubsub.close)()
+
+
+def create_redis_client():
+    """Async Redis client for REDIS_URL, or None when Redis is not configured."""
+    if REDIS_AVAILABLE and REDIS_URL:
+        return aioredis.from_url(REDIS_URL, decode_responses=True)
+    return None
+
+
+def create_progress_hub(client=None):
+    """Pick the Redis hub when a client is given, else the in-process one."""
+    if client is not None:
+        return RedisProgressHub(client)
+    return LocalProgressHub()
+
+
+@lru_cache(maxsize=1)
+def _sync_client():
+    return redis.Redis.from_url(REDIS_URL)
+
+
+def update_job_sync(job_id: str, **fields):
+    """Update a stored job's fields from a worker process (no-op without Redis)."""
+    if REDIS_AVAILABLE and REDIS_URL:
+        client = _sync_client()
+        key = job_key(job_id)
+        if client.exists(key):  # an expired job is not brought back
+            client.hset(key, mapping={k: json.dumps(v) for k, v in fields.items()})
+
+
+# A job in one of these states must not be started again: a rerun is a
+# full, paid LLM run
+STARTED_STATUSES = ("running", "completed", "failed")
+
+
+def claim_job_sync(job_id: str) -> bool:
+    """
+    Mark a stored job as running from a worker process, atomically.
+
+    The status is read and set in one WATCH/MULTI transaction, so of two
+    deliveries of the same job only one gets True. False if the job
+    expired, was already started, or Redis is off.
+    """
+    if not (REDIS_AVAILABLE and REDIS_URL):
+        return False
+    key = job_key(job_id)
+
+    def claim(pipe) -> bool:
+        status = pipe.hget(key, 'status')
+        if status is None or json.loads(status) in STARTED_STATUSES:
+            return False
+        pipe.multi()
+        pipe.hset(key, 'status', json.dumps('running'))
+        return True
+
+    return _sync_client().transaction(claim, key, value_from_callable=True)
+
+
+def publish_progress_sync(job_id: str, progress: int, message: str):
+    """Record and publish progress from a worker process (blocking client; no-op without Redis)."""
+    if REDIS_AVAILABLE and REDIS_URL:
+        update_job_sync(job_id, progress=progress, message=message)
+        _sync_client().publish(channel(job_id), encode_progress(progress, message))
@@ -4,28 +4,134 @@ FastAPI backend for web UI
 """
 
 import os
+import json
+import errno
+import time
 import uuid
 import asyncio
+import hashlib
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 import shutil
 
-from fastapi import FastAPI, File, UploadFile, WebSocket, WebSocketDisconnect, HTTPException, Query
-from fastapi.responses import FileResponse, JSONResponse
+import aiofiles
+try:
+    from python_multipart.exceptions import MultipartParseError
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.exceptions import MultipartParseError
+    from multipart.multipart import MultipartParser, parse_options_header
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Query, Request
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 import uvicorn
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import uuid_utils
+    UUID_UTILS_AVAILABLE = True
+except ImportError:
+    UUID_UTILS_AVAILABLE = False
+
 # Add parent directory to path
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from agents.rfp_orchestrator import RFPOrchestrator
+from config import MAX_UPLOAD_MB, UPLOAD_CONCURRENCY, UPLOAD_READ_TIMEOUT, WEB_WORKERS
 from rfp.structure import get_all_templates
+from web.progress import coalesce, create_progress_hub, create_redis_client, encode_progress
+from web.tasks import project_id_for, run_job, run_rfp_task
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (straight to bytes)."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
+# Downloads already compressed as files; served as-is and resumable with Range
+BINARY_DOWNLOADS = {"docx", "pdf"}
+
+
+class TextGZipMiddleware(GZipMiddleware):
+    """
+    GZip responses, except ranged requests and binary downloads.
+
+    Byte ranges must index the file itself, and docx/pdf are zip and
+    deflate containers that would only cost CPU to compress again.
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            path = scope["path"]
+            ranged = any(name == b"range" for name, _ in scope["headers"])
+            binary = path.startswith("/api/rfp/download/") and path.rsplit("/", 1)[-1] in BINARY_DOWNLOADS
+            if ranged or binary:
+                await self.app(scope, receive, send)
+                return
+        await super().__call__(scope, receive, send)
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Cap upload request bodies at MAX_UPLOAD_BYTES (pure ASGI, no request wrapping).
+
+    A declared Content-Length over the cap is answered with 413 before the
+    body is read; otherwise body chunks are counted as the app receives
+    them, and the read that crosses the cap raises a 413.
+    """
+
+    def __init__(self, app, path: str = "/api/rfp/upload"):
+        self.app = app
+        self.path = path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] != self.path:
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"Upload exceeds {MAX_UPLOAD_MB} MB"
+        length = dict(scope["headers"]).get(b"content-length", b"")
+        if length.isdigit() and int(length) > MAX_UPLOAD_BYTES:
+            await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def receive_limited():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > MAX_UPLOAD_BYTES:
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, receive_limited, send)
+
 
 # Initialize FastAPI
-app = FastAPI(title="KPLW RFP Generator API")
+app = FastAPI(
+    title="KPLW RFP Generator API",
+    default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+)
+
+# Reject oversized uploads, from Content-Length or as the body streams in.
+# Added first so it sits inside CORS (the last middleware added is the
+# outermost) and its early 413s carry CORS headers too
+app.add_middleware(UploadSizeLimitMiddleware)
 
 # CORS middleware
 app.add_middleware(
@@ -36,12 +142,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON and Markdown responses (status, templates, reports)
+app.add_middleware(TextGZipMiddleware, minimum_size=1024)
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="web"), name="static")
 
-# Storage for active jobs
-jobs = {}
-websocket_connections = {}
+# Shared Redis connection when REDIS_URL is set (None: in-memory mode)
+redis_client = create_redis_client()
+
+# Progress updates reach WebSocket clients through this hub
+progress_hub = create_progress_hub(redis_client)
+
+# WebSocket keepalive: uvicorn sends protocol-level ping frames this often
+# (seconds) and drops a peer that has not answered within the timeout.
+# Browsers answer them natively, so the text channel carries only progress
+WS_PING_INTERVAL = 20
+WS_PING_TIMEOUT = 20
+
+# Jobs are forgotten this long after creation
+JOB_TTL_SECONDS = 24 * 3600
 
 # Upload directory
 UPLOAD_DIR = Path("uploads")
@@ -50,17 +170,367 @@ UPLOAD_DIR.mkdir(exist_ok=True)
 OUTPUT_DIR = Path("outputs")
 OUTPUT_DIR.mkdir(exist_ok=True)
 
+# Uploaded files are stored once, by SHA-256, and linked into job directories
+BLOB_DIR = UPLOAD_DIR / "blobs"
+BLOB_DIR.mkdir(exist_ok=True)
+
+# Upload request size cap, and how many requests may write files at once
+# (the semaphore covers disk and hash work only, never network reads)
+MAX_UPLOAD_BYTES = MAX_UPLOAD_MB * 1024 * 1024
+UPLOAD_SEM = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+_uploads_writing = 0
+
+
+@contextlib.asynccontextmanager
+async def upload_slot():
+    """Hold one of the UPLOAD_CONCURRENCY slots for upload disk work."""
+    global _uploads_writing
+    async with UPLOAD_SEM:
+        _uploads_writing += 1
+        try:
+            yield
+        finally:
+            _uploads_writing -= 1
+
+
+def upload_slots_free() -> int:
+    """Number of upload slots not currently held."""
+    return UPLOAD_CONCURRENCY - _uploads_writing
+
+
+def new_job_id() -> str:
+    """Job ID that sorts by creation time (UUIDv7), or a random UUID without uuid-utils."""
+    if UUID_UTILS_AVAILABLE:
+        return str(uuid_utils.uuid7())
+    return str(uuid.uuid4())
+
+
+# Stored upload names are capped at this many UTF-8 bytes, leaving room
+# under the usual 255-byte filesystem limit for the "cv_" prefix and a
+# " (N)" duplicate marker
+MAX_FILENAME_BYTES = 200
+
+
+def safe_filename(filename: Optional[str]) -> str:
+    """
+    Reduce a client-supplied filename to a bare name inside the job directory.
+
+    Control characters are dropped, and an overlong name keeps its suffix
+    but has its stem cut short (on a character boundary) and tagged with a
+    BLAKE2b hash of the full name, so distinct long names stay distinct.
+    """
+    name = Path((filename or "").replace("\\", "/")).name
+    name = "".join(c for c in name if c.isprintable())
+    if name.strip(" .") == "":
+        raise HTTPException(status_code=400, detail=f"Invalid filename: {filename!r}")
+    if len(name.encode("utf-8")) > MAX_FILENAME_BYTES:
+        suffix = Path(name).suffix
+        if len(suffix.encode("utf-8")) > 16:
+            suffix = ""
+        tag = hashlib.blake2b(name.encode("utf-8"), digest_size=8).hexdigest()
+        budget = MAX_FILENAME_BYTES - len(suffix.encode("utf-8")) - len(tag) - 1
+        stem = name[:len(name) - len(Path(name).suffix)] if suffix else name
+        stem = stem.encode("utf-8")[:budget].decode("utf-8", "ignore")
+        name = f"{stem}-{tag}{suffix}"
+    return name
+
+
+# Downloads are streamed in chunks of this size
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Download file type -> (output file suffix after the project ID, media type)
+DOWNLOAD_TYPES = {
+    "md": ("_RAPPORT_COMPLET.md", "text/markdown"),
+    "docx": ("_PROPOSAL.docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    "pdf": ("_PROPOSAL.pdf", "application/pdf"),
+    "compliance": ("_COMPLIANCE_MATRIX.md", "text/markdown"),
+}
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range "bytes=start-end" header into inclusive offsets.
+
+    Returns None to serve the whole file (no header, or several ranges);
+    raises 416 when the range cannot be satisfied.
+    """
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+    start_text, _, end_text = range_header[len("bytes="):].strip().partition("-")
+    try:
+        if start_text:
+            start = int(start_text)
+            end = min(int(end_text), size - 1) if end_text else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start, end = max(size - int(end_text), 0), size - 1
+    except ValueError:
+        return None
+    if start > end or start >= size:
+        raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+async def read_with_timeout(chunks: AsyncIterator[bytes], timeout: float) -> AsyncIterator[bytes]:
+    """Yield chunks from a stream, raising TimeoutError if one read takes longer than timeout."""
+    chunks = aiter(chunks)
+    while True:
+        try:
+            async with asyncio.timeout(timeout):
+                chunk = await anext(chunks)
+        except StopAsyncIteration:
+            return
+        yield chunk
+
+
+async def iter_file(file_path: Path, start: int, length: int):
+    """Yield length bytes of a file from offset start, one chunk at a time."""
+    async with aiofiles.open(file_path, "rb") as f:
+        await f.seek(start)
+        while length > 0:
+            chunk = await f.read(min(DOWNLOAD_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+# Buffer for copying blobs where the kernel cannot copy them for us
+COPY_BUFFER_SIZE = 16 * 1024 * 1024
+
+
+def copy_blob(blob_path: Path, file_path: Path):
+    """Copy a blob into place with os.sendfile, or large-buffered reads and writes."""
+    with open(blob_path, "rb") as src, open(file_path, "xb") as dst:
+        size = os.fstat(src.fileno()).st_size
+        offset = 0
+        try:
+            while offset < size:
+                sent = os.sendfile(dst.fileno(), src.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        except (AttributeError, OSError):
+            # No sendfile on this platform or filesystem
+            src.seek(offset)
+            dst.seek(offset)
+            shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+
+
+# os.link failures that mean "no hard link here", not a problem with the target
+LINK_UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP}
+
+
+def link_blob(blob_path: Path, file_path: Path):
+    """Hard-link a stored blob into a job directory (copy if links are unsupported)."""
+    try:
+        os.link(blob_path, file_path)
+    except OSError as e:
+        if e.errno not in LINK_UNSUPPORTED_ERRNOS:
+            raise
+        copy_blob(blob_path, file_path)
+
+
+def store_blob(tmp_path: Path, digest: str) -> Path:
+    """Move a fully written upload into the blob store, unless that content is already there."""
+    blob_path = BLOB_DIR / digest
+    if blob_path.exists():
+        tmp_path.unlink()
+    else:
+        os.replace(tmp_path, blob_path)
+    return blob_path
+
+
+def prune_blobs(min_age: float = JOB_TTL_SECONDS) -> int:
+    """
+    Remove blobs that no job directory links to any more.
+
+    Blobs are never removed as jobs come and go; once old job directories
+    under UPLOAD_DIR have been deleted, this frees the content only they
+    used. A blob is kept while any hard link to it remains, and anything
+    younger than min_age seconds (including .upload- temp files still being
+    written) is left alone.
+
+    Returns:
+        Number of files removed
+    """
+    cutoff = time.time() - min_age
+    removed = 0
+    with os.scandir(BLOB_DIR) as entries:
+        for entry in entries:
+            stat = entry.stat(follow_symlinks=False)
+            if stat.st_nlink == 1 and stat.st_mtime < cutoff:
+                Path(entry.path).unlink(missing_ok=True)
+                removed += 1
+    return removed
+
+
+class StreamingUpload:
+    """
+    Parse a multipart upload straight off the request stream.
+
+    Parts of the "files" and "cv_files" fields are written chunk by chunk to
+    the blob store (SHA-256 computed on the way), then linked into the job
+    directory. Nothing is spooled to a temporary file or read into one bytes
+    object. Other form fields are ignored.
+
+    A finished part is closed, stored and linked in a background task while
+    the next part streams in; finish() gathers them all.
+    """
+
+    # Form field -> filename prefix in the job directory
+    FILE_FIELDS = {"files": "", "cv_files": "cv_"}
+
+    # Original filenames and hashes are recorded here, next to the uploads
+    MANIFEST_NAME = "manifest.json"
+
+    def __init__(self, boundary: bytes, job_dir: Path):
+        self.job_dir = job_dir
+        self.paths: Dict[str, List[str]] = {field: [] for field in self.FILE_FIELDS}
+        self.file_hashes: Dict[str, str] = {}
+        self.original_names: Dict[str, str] = {}  # stored name -> client filename
+        self._events = []
+        self._headers = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._part = None  # (field, file name, temp path, open file, sha256)
+        self._finishing: List[asyncio.Task] = []
+        self._complete = False  # set once the closing boundary is parsed
+        self._parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": lambda: self._events.append(("part", self._headers)),
+            "on_part_data": lambda data, start, end: self._events.append(("data", memoryview(data)[start:end])),
+            "on_part_end": lambda: self._events.append(("end", None)),
+            "on_end": self._on_end,
+        })
+
+    # Parser callbacks are synchronous: headers are assembled in place, and
+    # part events are queued for feed() to handle with async file I/O
+
+    def _on_part_begin(self):
+        self._headers = {}
+
+    def _on_header_field(self, data, start, end):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data, start, end):
+        self._header_value += data[start:end]
+
+    def _on_end(self):
+        self._complete = True
+
+    def _on_header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = self._header_value = b""
+
+    async def feed(self, chunk: bytes):
+        """Parse one chunk of the request body and write out its part data."""
+        # Body size is capped by UploadSizeLimitMiddleware as chunks are received
+        try:
+            self._parser.write(chunk)
+        except MultipartParseError:
+            raise HTTPException(status_code=400, detail="Malformed multipart body")
+        events, self._events = self._events, []
+        for kind, value in events:
+            if kind == "part":
+                await self._start_part(value)
+            elif kind == "data" and self._part is not None:
+                self._part[4].update(value)
+                await self._part[3].write(value)
+            elif kind == "end" and self._part is not None:
+                part, self._part = self._part, None
+                self._finishing.append(asyncio.create_task(self._finish_part(*part)))
+
+    async def _start_part(self, headers: dict):
+        _, params = parse_options_header(headers.get(b"content-disposition", b""))
+        field = params.get(b"name", b"").decode("utf-8", "replace")
+        filename = params.get(b"filename", b"").decode("utf-8", "replace")
+        if field not in self.FILE_FIELDS or not filename:
+            return  # not a file field, or an empty file input
+
+        name = self.FILE_FIELDS[field] + safe_filename(filename)
+        if name in self.original_names or name == self.MANIFEST_NAME:
+            # Same name uploaded twice: keep both rather than overwrite
+            stem, suffix = os.path.splitext(name)
+            copy = 2
+            while f"{stem} ({copy}){suffix}" in self.original_names:
+                copy += 1
+            name = f"{stem} ({copy}){suffix}"
+        self.original_names[name] = filename
+        tmp_path = BLOB_DIR / f".upload-{uuid.uuid4().hex}"
+        self._part = (field, name, tmp_path, await aiofiles.open(tmp_path, "wb"), hashlib.sha256())
+
+    async def _finish_part(self, field, name, tmp_path, f, digest):
+        await f.close()
+        file_path = self.job_dir / name
+        blob_path = await asyncio.to_thread(store_blob, tmp_path, digest.hexdigest())
+        await asyncio.to_thread(link_blob, blob_path, file_path)
+        return field, name, str(file_path), digest.hexdigest()
+
+    async def finish(self):
+        """Wait for every part to be stored, and record paths and hashes in upload order."""
+        if not self._complete or self._part is not None:
+            raise HTTPException(status_code=400, detail="Upload ended before the closing multipart boundary")
+        finishing, self._finishing = self._finishing, []
+        for field, name, file_path, digest in await asyncio.gather(*finishing):
+            self.paths[field].append(file_path)
+            self.file_hashes[name] = digest
+
+    async def write_manifest(self):
+        """Record each stored file's original filename and SHA-256 in the manifest."""
+        manifest = {
+            name: {"filename": self.original_names[name], "sha256": digest}
+            for name, digest in self.file_hashes.items()
+        }
+        async with aiofiles.open(self.job_dir / self.MANIFEST_NAME, "w", encoding="utf-8") as f:
+            await f.write(json.dumps(manifest, ensure_ascii=False, indent=2))
+
+    async def abort(self):
+        """Drop a part left half-written by a failed or truncated request."""
+        await asyncio.gather(*self._finishing, return_exceptions=True)
+        self._finishing = []
+        if self._part is not None:
+            _, _, tmp_path, f, _ = self._part
+            self._part = None
+            await f.close()
+            tmp_path.unlink(missing_ok=True)
+
 
 class JobManager:
-    """Manages RFP processing jobs."""
+    """
+    Manages RFP processing jobs.
 
-    def __init__(self):
-        self.jobs = {}
+    Jobs live in Redis hashes (job:{id}, JSON-encoded fields) when a client
+    is given, so every server process sees the same state; otherwise in a
+    local dict. Either way a job expires JOB_TTL_SECONDS after creation.
+    """
 
-    def create_job(self, rfp_files: List[str], cv_files: List[str], template: str, formats: List[str]) -> str:
+    def __init__(self, redis=None):
+        self.redis = redis
+        self._jobs = {}
+        self._expires_at = {}  # insertion-ordered, so the oldest job is first
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"job:{job_id}"
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        while self._expires_at:
+            job_id, expires_at = next(iter(self._expires_at.items()))
+            if expires_at > now:
+                break
+            del self._expires_at[job_id]
+            self._jobs.pop(job_id, None)
+
+    async def create_job(self, rfp_files: List[str], cv_files: List[str], template: str, formats: List[str],
+                         job_id: Optional[str] = None, file_hashes: Optional[dict] = None) -> str:
         """Create a new job."""
-        job_id = str(uuid.uuid4())
-        self.jobs[job_id] = {
+        job_id = job_id or new_job_id()
+        job = {
             'id': job_id,
             'status': 'pending',
             'progress': 0,
@@ -69,36 +539,50 @@ class JobManager:
             'cv_files': cv_files,
             'template': template,
             'formats': formats,
+            'file_hashes': file_hashes or {},
             'result': None,
             'error': None,
             'created_at': datetime.now().isoformat()
         }
+        if self.redis is not None:
+            key = self._key(job_id)
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.hset(key, mapping={k: json.dumps(v) for k, v in job.items()})
+                pipe.expire(key, JOB_TTL_SECONDS)
+                await pipe.execute()
+        else:
+            self._evict_expired()
+            self._jobs[job_id] = job
+            self._expires_at[job_id] = time.monotonic() + JOB_TTL_SECONDS
         return job_id
 
-    def get_job(self, job_id: str):
+    async def get_job(self, job_id: str):
         """Get job by ID."""
-        return self.jobs.get(job_id)
+        if self.redis is not None:
+            fields = await self.redis.hgetall(self._key(job_id))
+            return {k: json.loads(v) for k, v in fields.items()} or None
+        return self._jobs.get(job_id)
 
-    def update_job(self, job_id: str, **kwargs):
+    async def update_job(self, job_id: str, **kwargs):
         """Update job fields."""
-        if job_id in self.jobs:
-            self.jobs[job_id].update(kwargs)
+        if self.redis is not None:
+            key = self._key(job_id)
+            if await self.redis.exists(key):
+                await self.redis.hset(key, mapping={k: json.dumps(v) for k, v in kwargs.items()})
+        elif job_id in self._jobs:
+            self._jobs[job_id].update(kwargs)
 
     async def send_progress(self, job_id: str, progress: int, message: str):
         """Send progress update via WebSocket."""
-        self.update_job(job_id, progress=progress, message=message)
+        await self.update_job(job_id, progress=progress, message=message)
 
-        if job_id in websocket_connections:
-            try:
-                await websocket_connections[job_id].send_json({
-                    'progress': progress,
-                    'message': message
-                })
-            except:
-                pass
+        try:
+            await progress_hub.publish(job_id, encode_progress(progress, message))
+        except Exception:
+            pass
 
 
-job_manager = JobManager()
+job_manager = JobManager(redis_client)
 
 
 @app.get("/")
@@ -107,128 +591,184 @@ async def root():
     return FileResponse("web/index.html")
 
 
-@app.get("/api/templates")
-async def get_templates():
-    """Get available proposal templates."""
-    templates = get_all_templates()
-    return {
+@lru_cache(maxsize=1)
+def _templates_payload() -> Tuple[bytes, str]:
+    """Serialized template list and its ETag; templates are fixed at import."""
+    content = {
         "templates": [
             {
                 "name": t.name,
                 "display_name": t.display_name,
                 "description": t.description
             }
-            for t in templates
+            for t in get_all_templates()
         ]
     }
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(content)
+    else:
+        payload = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return payload, f'"{hashlib.sha256(payload).hexdigest()[:32]}"'
+
+
+@app.get("/api/templates")
+async def get_templates(request: Request):
+    """Get available proposal templates."""
+    payload, etag = _templates_payload()
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=3600"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match.strip() == "*" or etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=payload, media_type="application/json", headers=headers)
 
 
 @app.post("/api/rfp/upload")
 async def upload_rfp(
-    files: List[UploadFile] = File(...),
-    cv_files: Optional[List[UploadFile]] = File(None),
+    request: Request,
     template: str = Query("government_canada"),
     output_formats: str = Query("md,docx")
 ):
     """
     Upload RFP files and optionally CV files.
 
+    The multipart body carries the RFP documents in "files" fields and the
+    optional team member CVs in "cv_files" fields; it is parsed as it
+    streams in (see StreamingUpload).
+
     Args:
-        files: RFP document files
-        cv_files: Optional team member CV files
+        request: Multipart upload request
         template: Proposal template name
         output_formats: Comma-separated output formats
     """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+
     try:
         # Create job ID
-        job_id = str(uuid.uuid4())
+        job_id = new_job_id()
         job_dir = UPLOAD_DIR / job_id
         job_dir.mkdir(exist_ok=True)
 
-        # Save RFP files
-        rfp_file_paths = []
-        for file in files:
-            file_path = job_dir / file.filename
-            with open(file_path, "wb") as f:
-                content = await file.read()
-                f.write(content)
-            rfp_file_paths.append(str(file_path))
-
-        # Save CV files if provided
-        cv_file_paths = []
-        if cv_files:
-            for file in cv_files:
-                file_path = job_dir / f"cv_{file.filename}"
-                with open(file_path, "wb") as f:
-                    content = await file.read()
-                    f.write(content)
-                cv_file_paths.append(str(file_path))
+        upload = StreamingUpload(boundary, job_dir)
+        try:
+            # A client that sends nothing for UPLOAD_READ_TIMEOUT seconds is
+            # dropped; waiting for an upload slot does not count against it
+            async for chunk in read_with_timeout(request.stream(), UPLOAD_READ_TIMEOUT):
+                async with upload_slot():
+                    await upload.feed(chunk)
+            async with upload_slot():
+                await upload.finish()
+                await upload.write_manifest()
+            if not upload.paths["files"]:
+                raise HTTPException(status_code=422, detail="No RFP files uploaded")
+        except TimeoutError:
+            await upload.abort()
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise HTTPException(status_code=408, detail="Upload stalled")
+        except BaseException:
+            await upload.abort()
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise
+
+        rfp_file_paths = upload.paths["files"]
+        cv_file_paths = upload.paths["cv_files"]
 
         # Parse output formats
         formats = [f.strip() for f in output_formats.split(',')]
 
         # Create job
-        job_manager.create_job(
+        await job_manager.create_job(
             rfp_files=rfp_file_paths,
             cv_files=cv_file_paths,
             template=template,
-            formats=formats
+            formats=formats,
+            job_id=job_id,
+            file_hashes=upload.file_hashes
         )
 
         # Start processing in background
         asyncio.create_task(process_rfp_job(job_id))
 
-        return JSONResponse({
+        return {
             "job_id": job_id,
             "message": "Processing started",
             "cv_count": len(cv_file_paths) if cv_file_paths else 0
-        })
+        }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@lru_cache(maxsize=1)
+def job_pool() -> ProcessPoolExecutor:
+    """
+    Worker processes for in-process mode (no Celery), created on first job.
+
+    Spawned rather than forked: the server process has an event loop and
+    helper threads running that a fork would copy mid-flight.
+    """
+    return ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("spawn"))
+
+
+# In-process jobs waiting on job_pool(), by job ID
+pool_jobs: Dict[str, asyncio.Task] = {}
+
+
 async def process_rfp_job(job_id: str):
     """Process RFP job in background."""
     try:
-        job = job_manager.get_job(job_id)
+        job = await job_manager.get_job(job_id)
+        cv_files = job['cv_files'] if job['cv_files'] else None
 
         # Update progress
         await job_manager.send_progress(job_id, 10, "Initializing agents...")
 
-        # Create orchestrator
-        orchestrator = RFPOrchestrator()
+        if run_rfp_task is not None:
+            # Hand the job to a Celery worker, which records progress and the
+            # outcome in the job's Redis hash itself; nothing waits here
+            await job_manager.send_progress(job_id, 15, "Queued for processing...")
+            await asyncio.to_thread(
+                run_rfp_task.delay, job_id, job['rfp_files'], cv_files, job['template'], job['formats']
+            )
+            return
 
+        # Run the workflow in a worker process so the event loop stays free
         await job_manager.send_progress(job_id, 20, "Running TIMBO analysis...")
-
-        # Run RFP workflow
-        cv_files = job['cv_files'] if job['cv_files'] else None
-
-        result = orchestrator.run_rfp(
-            rfp_files=job['rfp_files'],
-            template_name=job['template'],
-            output_formats=job['formats'],
-            team_cvs=cv_files  # Pass CV files to orchestrator
-        )
+        pool_jobs[job_id] = asyncio.current_task()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(
+                job_pool(), run_job, job['rfp_files'], cv_files, job['template'], job['formats'],
+                project_id_for(job_id)
+            )
+        finally:
+            pool_jobs.pop(job_id, None)
 
         await job_manager.send_progress(job_id, 100, "Complete!")
 
         # Update job with result
-        job_manager.update_job(
+        await job_manager.update_job(
             job_id,
             status='completed',
-            result={
-                'rana_score': result.get('rana_score', 0),
-                'compliance_score': result.get('compliance_score', 0),
-                'iterations': result.get('iteration_count', 0),
-                'status': result.get('status', 'unknown'),
-                'project_id': result.get('project_id'),
-                'generated_files': result.get('generated_files', {})
-            }
+            result=result
         )
 
+    except asyncio.CancelledError:
+        # The server is shutting down (see shutdown_job_pool)
+        await job_manager.update_job(
+            job_id,
+            status='failed',
+            error="Server shut down before the job finished"
+        )
+        raise
+
     except Exception as e:
-        job_manager.update_job(
+        await job_manager.update_job(
             job_id,
             status='failed',
             error=str(e)
@@ -236,10 +776,31 @@ async def process_rfp_job(job_id: str):
         await job_manager.send_progress(job_id, 0, f"Error: {str(e)}")
 
 
+@app.on_event("shutdown")
+async def shutdown_job_pool():
+    """
+    Stop the in-process job pool without waiting for it.
+
+    Queued jobs are cancelled and running workers terminated (otherwise the
+    interpreter's exit handler waits for them); every job still waiting on
+    the pool is marked failed.
+    """
+    if job_pool.cache_info().currsize:
+        job_pool().shutdown(wait=False, cancel_futures=True)
+        for process in multiprocessing.active_children():
+            process.terminate()
+        job_pool.cache_clear()
+
+    tasks = list(pool_jobs.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
 @app.get("/api/rfp/status/{job_id}")
 async def get_job_status(job_id: str):
     """Get job status."""
-    job = job_manager.get_job(job_id)
+    job = await job_manager.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
@@ -250,63 +811,104 @@ async def get_job_status(job_id: str):
 async def websocket_endpoint(websocket: WebSocket, job_id: str):
     """WebSocket endpoint for real-time progress updates."""
     await websocket.accept()
-    websocket_connections[job_id] = websocket
+
+    async def relay():
+        # Text frames: the page JSON.parses event.data
+        async for payload in coalesce(progress_hub.subscribe(job_id)):
+            await websocket.send_text(payload)
+
+    relay_task = asyncio.create_task(relay())
+    receive_task = None
 
     try:
+        # Dead peers are detected by uvicorn's ping frames (WS_PING_INTERVAL);
+        # a client 'ping' text frame is still answered with 'pong'
         while True:
-            # Keep connection alive
-            data = await websocket.receive_text()
+            receive_task = receive_task or asyncio.create_task(websocket.receive_text())
+            done, _ = await asyncio.wait({receive_task, relay_task}, return_when=asyncio.FIRST_COMPLETED)
+            if relay_task in done:
+                break  # sending failed; the peer is gone
+
+            data = receive_task.result()
+            receive_task = None
             if data == 'ping':
                 await websocket.send_text('pong')
     except WebSocketDisconnect:
-        if job_id in websocket_connections:
-            del websocket_connections[job_id]
+        pass
+    finally:
+        # Each task's outcome is retrieved as it finishes, without holding up
+        # the endpoint (which may itself be cancelled as the socket closes)
+        for task in (relay_task, receive_task):
+            if task is not None:
+                task.add_done_callback(lambda task: report_websocket_error(job_id, task))
+                task.cancel()
+
+
+def report_websocket_error(job_id: str, task: asyncio.Task):
+    """Print what a finished WebSocket task raised; a disconnect is the normal end."""
+    error = None if task.cancelled() else task.exception()
+    if error is not None and not isinstance(error, WebSocketDisconnect):
+        print(f"[ERROR] Progress WebSocket for job {job_id} failed: {error!r}")
 
 
 @app.get("/api/rfp/download/{job_id}/{file_type}")
-async def download_file(job_id: str, file_type: str):
+async def download_file(job_id: str, file_type: str, request: Request):
     """Download generated files."""
-    job = job_manager.get_job(job_id)
+    job = await job_manager.get_job(job_id)
     if not job or job['status'] != 'completed':
         raise HTTPException(status_code=404, detail="Job not found or not completed")
 
-    project_id = job['result']['project_id']
-    output_dir = Path("outputs")
-
-    # Determine file path based on type
-    if file_type == "md":
-        file_path = output_dir / f"{project_id}_RAPPORT_COMPLET.md"
-        media_type = "text/markdown"
-    elif file_type == "docx":
-        file_path = output_dir / f"{project_id}_PROPOSAL.docx"
-        media_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-    elif file_type == "pdf":
-        file_path = output_dir / f"{project_id}_PROPOSAL.pdf"
-        media_type = "application/pdf"
-    elif file_type == "compliance":
-        file_path = output_dir / f"{project_id}_COMPLIANCE_MATRIX.md"
-        media_type = "text/markdown"
-    else:
+    entry = DOWNLOAD_TYPES.get(file_type)
+    if entry is None:
         raise HTTPException(status_code=400, detail="Invalid file type")
+    suffix, media_type = entry
+    file_path = OUTPUT_DIR / f"{job['result']['project_id']}{suffix}"
 
-    if not file_path.exists():
+    try:
+        size = file_path.stat().st_size
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="File not found")
 
-    return FileResponse(
-        path=str(file_path),
+    headers = {"Content-Disposition": f'attachment; filename="{file_path.name}"'}
+    if file_type in BINARY_DOWNLOADS:
+        # Text downloads may be gzipped, so only binary ones advertise ranges
+        headers["Accept-Ranges"] = "bytes"
+    byte_range = parse_range(request.headers.get("range"), size)
+    if byte_range is None:
+        start, end, status_code = 0, size - 1, 200
+    else:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+
+    return StreamingResponse(
+        iter_file(file_path, start, end - start + 1),
+        status_code=status_code,
         media_type=media_type,
-        filename=file_path.name
+        headers=headers
     )
 
 
 if __name__ == "__main__":
+    # Several worker processes are only sound when jobs and progress live in
+    # Redis; in-memory mode must stay in a single process
+    workers = (WEB_WORKERS or os.cpu_count() or 1) if redis_client is not None else 1
+
     print("🚀 Starting KPLW RFP Web Server...")
     print("📍 Open http://localhost:8000 in your browser")
+    print(f"⚙️  Workers: {workers}")
     print("=" * 60)
 
+    # loop/http "auto" pick uvloop and httptools when installed (uvicorn[standard])
     uvicorn.run(
-        app,
+        "web.server:app" if workers > 1 else app,
         host="0.0.0.0",
         port=8000,
+        workers=workers,
+        loop="auto",
+        http="auto",
+        ws_ping_interval=WS_PING_INTERVAL,
+        ws_ping_timeout=WS_PING_TIMEOUT,
         log_level="info"
     )
@@ -0,0 +1,98 @@
+"""
+KPLW RFP Background Tasks
+Run RFP generation jobs outside the web server's event loop
+
+With REDIS_URL set and Celery installed, jobs are queued to Celery workers:
+    celery -A web.tasks worker -c 2
+Otherwise the web server runs them in-process.
+"""
+
+import os
+import sys
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import REDIS_URL
+from agents.rfp_orchestrator import RFPOrchestrator
+from web.progress import claim_job_sync, publish_progress_sync, update_job_sync
+
+try:
+    from celery import Celery
+    CELERY_AVAILABLE = True
+except ImportError:
+    CELERY_AVAILABLE = False
+
+
+def project_id_for(job_id: str) -> str:
+    """Project ID naming a job's output files; unique per job, so concurrent jobs never share files."""
+    return f"RFP-{job_id}"
+
+
+def run_job(rfp_files: List[str], cv_files: Optional[List[str]], template: str, formats: List[str],
+            project_id: Optional[str] = None) -> dict:
+    """Run the RFP workflow for one job and return the summary shown in the UI."""
+    orchestrator = RFPOrchestrator()
+    result = orchestrator.run_rfp(
+        rfp_files=rfp_files,
+        template_name=template,
+        output_formats=formats,
+        team_cvs=cv_files or None,
+        project_id=project_id
+    )
+    return {
+        'rana_score': result.get('rana_score', 0),
+        'compliance_score': result.get('compliance_score', 0),
+        'iterations': result.get('iteration_count', 0),
+        'status': result.get('status', 'unknown'),
+        'project_id': result.get('project_id'),
+        'generated_files': result.get('generated_files', {})
+    }
+
+
+# Seconds before Redis hands an unacknowledged task to another worker;
+# above the longest run, so a job waiting behind another is not duplicated
+VISIBILITY_TIMEOUT = 6 * 3600
+
+
+# Celery app and task exist only when a broker is configured
+if CELERY_AVAILABLE and REDIS_URL:
+    # No result backend: workers record outcomes in the job's Redis hash
+    celery_app = Celery("kplw", broker=REDIS_URL)
+    celery_app.conf.update(
+        task_serializer="json",
+        accept_content=["json"],
+        task_ignore_result=True,
+        # Ack on receipt (the default): a worker that dies mid-run loses the
+        # job rather than having Redis redeliver it for a second paid run
+        task_acks_late=False,
+        worker_prefetch_multiplier=1,  # jobs run for minutes; don't hoard them
+        broker_transport_options={"visibility_timeout": VISIBILITY_TIMEOUT},
+    )
+
+    @celery_app.task(name="kplw.run_rfp")
+    def run_rfp_task(job_id: str, rfp_files: List[str], cv_files: Optional[List[str]],
+                     template: str, formats: List[str]) -> Optional[dict]:
+        """
+        Celery entry point for run_job().
+
+        The worker records the outcome in the job's Redis hash itself, so a
+        job still completes if the web process that queued it restarts.
+        A job that expired or was already claimed by another delivery is
+        skipped.
+        """
+        if not claim_job_sync(job_id):
+            return None
+        publish_progress_sync(job_id, 20, "Running TIMBO analysis...")
+        try:
+            result = run_job(rfp_files, cv_files, template, formats, project_id_for(job_id))
+        except Exception as e:
+            update_job_sync(job_id, status='failed', error=str(e))
+            publish_progress_sync(job_id, 0, f"Error: {str(e)}")
+            raise
+        update_job_sync(job_id, status='completed', result=result)
+        publish_progress_sync(job_id, 100, "Complete!")
+        return result
+else:
+    celery_app = None
+    run_rfp_task = None